@@ -1,12 +1,31 @@
 from flask import Flask, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
-import click_call_scraper
 import os
+import threading
 from datetime import datetime
 
+import config
+from work_queue import open_work_queue
+from discovery_cache import normalize_search_url
+from phone_index import PhoneIndex
+from job_scheduler import JobScheduler, QueueFull, DONE
+
 app = Flask(__name__)
 CORS(app)
 
+# Shared history of every run: duplicate detection, /api/stats and the query API all read it
+MASTER_WORKBOOK = 'Dubizzle Data.xlsx'
+master_workbook_lock = threading.Lock()  # jobs run in worker threads - one writer at a time
+
+# SQLite index over the Master Data history, rebuilt when the workbook changes
+phone_index = PhoneIndex(MASTER_WORKBOOK, config.PHONE_INDEX_PATH)
+
+# click_call_scraper pulls in selenium, webdriver_manager and (on export) pandas.
+# Import it on first use so workers boot fast and /, /api/status answer immediately.
+def get_scraper_module():
+    import click_call_scraper
+    return click_call_scraper
+
 # Serve the main HTML dashboard
 @app.route('/')
 def index():
@@ -17,37 +36,94 @@ def index():
 def assets(filename):
     return send_from_directory('assets', filename)
 
-# API: Start scraping
+def run_scrape_job(job):
+    """Run one scrape job from the scheduler: its rows go to the job's own download file and the master workbook"""
+    # Share the crawl of this search with other instances if WORK_QUEUE_URL is set
+    work_queue = open_work_queue(config.WORK_QUEUE_URL, lease_seconds=config.WORK_QUEUE_LEASE_SECONDS,
+                                 crawl=normalize_search_url(job.params['url']))
+    try:
+        scraper = get_scraper_module().ClickCallScraper(headless=True, work_queue=work_queue)
+        scraper.scrape_with_real_phones(job.params['url'], job.params['max_cars'],
+                                        max_duration=job.params.get('max_duration'))
+        scraper.save_results(job.output_path)
+        # Append the same rows to the shared Master Data so web runs build up the history too
+        with master_workbook_lock:
+            scraper.save_results(MASTER_WORKBOOK)
+    finally:
+        if work_queue:
+            work_queue.close()
+
+# At most MAX_CONCURRENT_JOBS browsers at once, MAX_QUEUED_JOBS waiting (per process)
+scheduler = JobScheduler.from_config(run_scrape_job)
+
+def job_response(job):
+    data = job.to_dict()
+    data['position'] = scheduler.position(job)
+    data['eta_seconds'] = scheduler.eta_seconds(job)
+    data['status_url'] = f'/api/jobs/{job.id}'
+    data['download_url'] = f'/api/jobs/{job.id}/download'
+    return data
+
+# API: Start scraping (queued - poll the returned status_url, then fetch download_url)
 @app.route('/api/scrape', methods=['POST'])
 def scrape_dubizzle():
     try:
         data = request.json
         url = data['url']
-        max_cars = data.get('max_cars', 20)
-        
-        # Run scraper
-        scraper = click_call_scraper.ClickCallScraper(headless=True)
-        scraper.scrape_with_real_phones(url, max_cars)
-        scraper.save_results('results.xlsx')
-        
-        return send_file('results.xlsx', 
-                        as_attachment=True,
-                        download_name=f'dubizzle_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx')
-    
+        max_cars = int(data.get('max_cars', 20))
+        # Optional wall-clock budget in seconds - the job stops cleanly and keeps its results
+        max_duration = data.get('max_duration')
+        if max_duration is not None:
+            max_duration = float(max_duration)
+            if max_duration <= 0:
+                raise ValueError('max_duration must be positive')
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': f'invalid request: {e}'}), 400
+    
+    try:
+        job = scheduler.submit({'url': url, 'max_cars': max_cars, 'max_duration': max_duration})
+    except QueueFull as e:
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+    
+    return jsonify(job_response(job)), 202
+
+# API: Job status and queue position
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = scheduler.get(job_id)
+    if job is None:
+        return jsonify({'error': 'job not found'}), 404
+    return jsonify(job_response(job))
+
+# API: Download a finished job's results
+@app.route('/api/jobs/<job_id>/download')
+def job_download(job_id):
+    job = scheduler.get(job_id)
+    if job is None:
+        return jsonify({'error': 'job not found'}), 404
+    if job.state != DONE:
+        return jsonify({'error': f'job is {job.state}', 'state': job.state}), 409
+    if not os.path.exists(job.output_path):
+        return jsonify({'error': 'no new data found by this job'}), 404
+    
+    finished = datetime.fromtimestamp(job.finished_at).strftime("%Y%m%d_%H%M%S")
+    return send_file(os.path.abspath(job.output_path),
+                    as_attachment=True,
+                    download_name=f'dubizzle_results_{finished}.xlsx')
 
 # API: Get system status
 @app.route('/api/status')
 def status():
-    return jsonify({'status': 'ready', 'message': 'Dubizzle scraper online'})
+    return jsonify({'status': 'ready', 'message': 'Dubizzle scraper online', 'jobs': scheduler.stats()})
 
 # API: Get database statistics
 @app.route('/api/stats')
 def get_stats():
     try:
-        scraper = click_call_scraper.ClickCallScraper()
-        scraper.load_existing_phone_numbers('Dubizzle Data.xlsx')
+        scraper = get_scraper_module().ClickCallScraper()
+        scraper.load_existing_phone_numbers(MASTER_WORKBOOK)
         return jsonify({
             'existing_phones': len(scraper.existing_phones),
             'status': 'ready'
@@ -58,6 +134,53 @@ def get_stats():
             'status': 'ready'
         })
 
+def _query_args():
+    """Common filter/pagination args for the query API (raises ValueError on bad input)"""
+    args = request.args
+    min_price = args.get('min_price')
+    max_price = args.get('max_price')
+    return {
+        'since': args.get('since'),
+        'until': args.get('until'),
+        'min_price': int(min_price) if min_price else None,
+        'max_price': int(max_price) if max_price else None,
+        'cursor': args.get('cursor'),
+        'limit': int(args.get('limit', 50)),
+    }
+
+# API: Query collected phone numbers
+# GET /api/phones?prefix=05&since=2024-01-01&until=2024-12-31&limit=50&cursor=...
+@app.route('/api/phones')
+def list_phones():
+    try:
+        query = _query_args()
+        items, next_cursor = phone_index.query_phones(
+            prefix=request.args.get('prefix'), since=query['since'], until=query['until'],
+            cursor=query['cursor'], limit=query['limit'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'items': items, 'next_cursor': next_cursor})
+
+# API: Every listing seen with one phone number (any format)
+@app.route('/api/phones/<path:phone>')
+def lookup_phone(phone):
+    listings = phone_index.lookup_phone(phone)
+    if not listings:
+        return jsonify({'error': 'phone not found', 'phone': phone}), 404
+    return jsonify({'phone': phone, 'listings': listings})
+
+# API: Query collected listings
+# GET /api/listings?make=toyota&min_price=20000&max_price=60000&phone_prefix=05&since=...&cursor=...
+@app.route('/api/listings')
+def list_listings():
+    try:
+        query = _query_args()
+        items, next_cursor = phone_index.query_listings(
+            phone_prefix=request.args.get('phone_prefix'), make=request.args.get('make'), **query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'items': items, 'next_cursor': next_cursor})
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False) 
\ No newline at end of file
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the web service
+Runs `python -X importtime -c "import app"` in a fresh interpreter and reports
+the total import time plus the slowest modules. Exits non-zero if the import
+goes over budget or drags in the heavy scraping/export stack.
+
+Usage: python bench_startup.py [--budget-ms 1000] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules that must only be loaded once a job or export needs them
+HEAVY_MODULES = ['selenium', 'webdriver_manager', 'pandas', 'numpy', 'openpyxl']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module='app'):
+    """Import `module` in a clean interpreter, return [(cumulative_us, self_us, depth, name)]"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=here, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, name))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget-ms', type=float, default=1000.0)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+    loaded = {name.split('.')[0] for _, _, _, name in rows}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+    print(f"⏱️  import {args.module}: {total_ms:.1f} ms ({len(rows)} modules)")
+    print(f"🐢 Slowest top-level imports:")
+    top_level = sorted((r for r in rows if r[2] <= 1), reverse=True)[:args.top]
+    for cumulative_us, _, _, name in top_level:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    ok = True
+    if heavy:
+        print(f"❌ Heavy modules loaded at import time: {', '.join(heavy)}")
+        ok = False
+    if total_ms > args.budget_ms:
+        print(f"❌ Over budget: {total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print(f"✅ Within budget ({args.budget_ms:.0f} ms), no heavy modules loaded")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
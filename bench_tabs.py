@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Single-tab vs multi-tab benchmark
+Runs the same search with 1 tab and with N tabs (one Chrome session each) and compares
+per-car processing time and browser memory. Needs Chrome and network access.
+Results are not saved to the workbook.
+
+Usage: python bench_tabs.py "<dubizzle search url>" --cars 20 --tabs 1 3 4
+"""
+
+import sys
+import argparse
+
+from click_call_scraper import ClickCallScraper
+
+
+class BenchScraper(ClickCallScraper):
+    """Records peak browser memory after every car"""
+    peak_rss_mb = 0.0
+
+    def store_result(self, car_data):
+        super().store_result(car_data)
+        rss_mb = self.browser_rss_mb()
+        if rss_mb:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url', help='Dubizzle search URL')
+    parser.add_argument('--cars', type=int, default=20, help='new cars to process per run')
+    parser.add_argument('--tabs', type=int, nargs='+', default=[1, 3])
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    results = []
+    for tabs in args.tabs:
+        print(f"\n{'#'*80}\n🏁 BENCHMARK RUN: {tabs} tab(s)\n{'#'*80}")
+        scraper = BenchScraper(headless=args.headless, tabs=tabs)
+        scraper.scrape_with_real_phones(args.url, args.cars)
+        stats = scraper.run_stats
+        results.append((tabs, stats.get('checked', 0), stats.get('processing_seconds', 0.0),
+                        stats.get('seconds_per_car', 0.0), scraper.peak_rss_mb,
+                        scraper.pacer.successes, scraper.pacer.errors))
+
+    print(f"\n📊 RESULTS ({args.cars} cars per run)")
+    print(f"{'tabs':>5} {'cars':>6} {'total s':>9} {'s/car':>7} {'speedup':>8} {'peak MB':>8} {'loads':>6} {'errors':>7}")
+    baseline = results[0][3] or None
+    for tabs, checked, total, per_car, peak, loads, errors in results:
+        speedup = f"{baseline / per_car:.2f}x" if baseline and per_car else '-'
+        print(f"{tabs:>5} {checked:>6} {total:>9.0f} {per_car:>7.1f} {speedup:>8} {peak:>8.0f} {loads:>6} {errors:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Work queue check
+Runs the same scenarios against both backends - a temporary SQLite file and fakeredis
+as the local Redis stand-in - with two workers sharing each queue: priority order of
+claims, lease expiry, release (including a stale release by a worker whose lease was
+taken over), ack, crawl isolation and the shared phone set. Exits non-zero on any failure.
+Needs the dev dependencies: pip install -r requirements-dev.txt
+
+Usage: python check_work_queue.py [--backend sqlite redis]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from work_queue import SQLiteWorkQueue, RedisWorkQueue
+
+LEASE = 0.3  # seconds - short so expiry can be observed
+
+
+def sqlite_factory(directory):
+    path = os.path.join(directory, 'work_queue.db')
+    return lambda **kwargs: SQLiteWorkQueue(path, **kwargs)
+
+
+def redis_factory(directory):
+    import fakeredis
+    server = fakeredis.FakeServer()
+    return lambda **kwargs: RedisWorkQueue(fakeredis.FakeRedis(server=server), **kwargs)
+
+
+def run_checks(make_queue):
+    """Yield (description, passed) for each scenario"""
+    a = make_queue(worker_id='A', lease_seconds=LEASE, crawl='search-1')
+    b = make_queue(worker_id='B', lease_seconds=60, crawl='search-1')
+    other = make_queue(worker_id='C', lease_seconds=60, crawl='search-2')
+
+    yield "enqueue counts only new URLs", (a.enqueue(['u1', 'u2', 'u3'], {'u1': 1, 'u2': 3, 'u3': 2}) == 3
+                                           and b.enqueue(['u2', 'u4']) == 1)
+    yield "other crawls don't see the listings", other.pending_count() == 0 and other.claim() is None
+
+    yield "claim takes the highest priority first", a.claim() == 'u2'
+    yield "a leased URL is not handed out again", b.claim() == 'u3'
+
+    time.sleep(LEASE + 0.1)
+    yield "an expired lease is claimable by another worker", b.claim() == 'u2'
+
+    a.release('u2')
+    yield "release by a worker whose lease expired is ignored", b.claim() == 'u1' and b.claim() == 'u4'
+
+    b.release('u1')
+    yield "release by the lease holder requeues the URL", a.claim() == 'u1'
+
+    a.ack('u1')
+    for url in ('u2', 'u3', 'u4'):
+        b.ack(url)
+    yield "acked URLs are not claimed again", a.claim() is None and a.pending_count() == 0
+    yield "a drained crawl starts over on the next enqueue", a.enqueue(['u1', 'u5']) == 2
+
+    yield "phone set is shared across crawls", (a.add_phone('971501234567') and not other.add_phone('971501234567')
+                                                and b.has_phone('971501234567'))
+
+    for queue in (a, b, other):
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', nargs='+', choices=['sqlite', 'redis'], default=['sqlite', 'redis'])
+    args = parser.parse_args()
+
+    factories = {'sqlite': sqlite_factory, 'redis': redis_factory}
+    failures = 0
+    for backend in args.backend:
+        print(f"🧪 {backend}")
+        with tempfile.TemporaryDirectory() as directory:
+            for description, passed in run_checks(factories[backend](directory)):
+                print(f"  {'✅' if passed else '❌'} {description}")
+                failures += not passed
+
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("✅ All work queue checks passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
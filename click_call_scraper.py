@@ -5,13 +5,14 @@ Focus: Click the actual call button and get the REAL phone number that appears
 """
 
 import time
-import random
-import pandas as pd
 from datetime import datetime
 import logging
 import re
 import os
-from typing import List, Dict, Optional, Set
+import uuid
+from collections import Counter, deque
+from urllib.parse import urlsplit
+from typing import Deque, List, Dict, Optional, Set
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -20,11 +21,27 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+import config
+from pacing import PacingController
+from work_queue import WorkQueue, SQLiteWorkQueue, open_work_queue
+from records import ListingRecord, RecordSpool, write_streamed_workbook
+from tab_pool import TabPool
+from run_budget import RunBudget
+from discovery_cache import DiscoveryCache, normalize_search_url
+from page_archive import PageArchive
+from extractors import (
+    POPUP_SELECTORS, PHONE_CONTAINER_SELECTORS, TITLE_SELECTORS, PRICE_SELECTORS, LISTING_URL_PATTERN,
+    extract_listing_urls, listing_priority, find_phone, find_uae_phone, find_container_phone, is_title, is_price,
+)
+from failures import (
+    TRANSIENT, STRUCTURAL, DEAD_LISTING, FAILURE_CLASSES,
+    ListingFailure, RetryQueue, classify_failure, is_session_dead, backoff_delay,
+)
+
+# pandas (numpy + openpyxl) is only imported when reading/writing Excel - see load_existing_phone_numbers/save_results
 logger = logging.getLogger(__name__)
 
 
@@ -35,11 +52,35 @@ class ClickCallScraper:
     Note: Type checker warnings about self.driver being None can be ignored.
     The driver is always initialized via setup_driver() before any methods that use it.
     """
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, work_queue: Optional[WorkQueue] = None, streaming: bool = False,
+                 tabs: Optional[int] = None):
         self.driver: Optional[webdriver.Chrome] = None  # Initialized in setup_driver()
         self.headless: bool = headless
-        self.scraped_data: List[Dict] = []
+        self.tabs: int = tabs or config.BROWSER_TABS  # >1 = prefetch next listings in background tabs
+        self.tab_pool: Optional[TabPool] = None  # Initialized in setup_driver() when tabs > 1
+        self.lookahead: Deque[str] = deque()  # Listings taken from the frontier for prefetching
+        self.work_queue: Optional[WorkQueue] = work_queue  # Shared with other instances, if any
+        self.scraped_data: List[ListingRecord] = []
         self.existing_phones: Set[str] = set()  # Track existing phone numbers
+        self.pacer = PacingController.from_config()  # Adaptive delay between page loads
+        self.failure_counts: Counter = Counter()  # Failures per class for this run
+        self.run_stats: Dict[str, float] = {}  # Timings/counts of the last scrape_with_real_phones run
+        self.budget: Optional[RunBudget] = None  # Wall-clock budget of the current run
+        self.discovery_cache: Optional[DiscoveryCache] = DiscoveryCache.from_config()  # None if disabled
+        self.page_archive: Optional[PageArchive] = PageArchive.from_config()  # Set CAPTURE_DIR to archive pages
+        
+        # Streaming (bounded-memory) mode: results go to a disk spool in batches, the frontier
+        # lives in a private SQLite queue, and the browser is recycled when it grows too big
+        self.streaming: bool = streaming
+        self.spool: Optional[RecordSpool] = None
+        self.frontier_path: Optional[str] = None
+        if streaming:
+            run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+            spool_path = os.path.join(config.STREAM_SPOOL_DIR, f"results_{run_id}.csv")
+            self.spool = RecordSpool(spool_path, batch_size=config.STREAM_BATCH_SIZE)
+            if work_queue is None:
+                self.frontier_path = os.path.join(config.STREAM_SPOOL_DIR, f"frontier_{run_id}.db")
+                self.work_queue = SQLiteWorkQueue(self.frontier_path)
         
     def setup_driver(self):
         """Setup Chrome WebDriver"""
@@ -60,8 +101,91 @@ class ClickCallScraper:
         
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.driver.set_page_load_timeout(config.TIMEOUT)
         
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        # Background tabs belong to this session - a restarted browser starts with none
+        if self.tabs > 1:
+            self.tab_pool = TabPool(self.driver, self.pacer, tabs=self.tabs, load_timeout=config.TIMEOUT)
+    
+    def restart_driver(self):
+        """Throw away the current browser session and start a fresh one"""
+        print("♻️ Restarting browser session...")
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+        self.setup_driver()
+    
+    def browser_rss_mb(self):
+        """Resident memory of chromedriver + Chrome and all its child processes in MB (Linux only, else None)"""
+        try:
+            pids = [self.driver.service.process.pid]
+        except AttributeError:
+            return None
+        
+        total_kb = 0
+        measured = False
+        seen = set()
+        while pids:
+            pid = pids.pop()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            try:
+                with open(f'/proc/{pid}/status') as f:
+                    for line in f:
+                        if line.startswith('VmRSS:'):
+                            total_kb += int(line.split()[1])
+                            measured = True
+                            break
+                for tid in os.listdir(f'/proc/{pid}/task'):
+                    with open(f'/proc/{pid}/task/{tid}/children') as f:
+                        pids.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                continue
+        return total_kb / 1024 if measured else None
+    
+    def recycle_browser_if_needed(self):
+        """Restart the browser once it uses more than BROWSER_RSS_LIMIT_MB"""
+        rss_mb = self.browser_rss_mb()
+        if rss_mb is not None and rss_mb > config.BROWSER_RSS_LIMIT_MB:
+            print(f"🧹 Browser using {rss_mb:.0f} MB (limit {config.BROWSER_RSS_LIMIT_MB} MB)")
+            self.restart_driver()
+    
+    def store_result(self, car_data):
+        """Keep a result as a compact record - in memory, or in the spool when streaming"""
+        record = ListingRecord.from_result(car_data)
+        if self.spool is not None:
+            self.spool.append(record)
+        else:
+            self.scraped_data.append(record)
+    
+    @property
+    def result_count(self):
+        """Number of results collected this run"""
+        if self.spool is not None:
+            return len(self.spool)
+        return len(self.scraped_data)
+    
+    def close_frontier(self):
+        """Remove the private on-disk frontier used in streaming mode"""
+        if self.frontier_path is None:
+            return
+        self.work_queue.close()
+        self.work_queue = None
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.frontier_path + suffix):
+                os.remove(self.frontier_path + suffix)
+        self.frontier_path = None
+    
+    def record_failure(self, kind, url, cause=None):
+        """Count a failure and log it"""
+        self.failure_counts[kind] += 1
+        print(f"⚠️ {kind.upper()} failure on {url}: {cause}")
     
     def load_existing_phone_numbers(self, filename="Dubizzle Data.xlsx"):
         """Load existing phone numbers from Excel file to avoid duplicates"""
@@ -70,6 +194,7 @@ class ClickCallScraper:
         try:
             if os.path.exists(filename):
                 print(f"📋 Loading existing phone numbers from {filename}...")
+                import pandas as pd
                 
                 # Try to read from 'Master Data' sheet first, then fallback to default sheet
                 try:
@@ -128,8 +253,18 @@ class ClickCallScraper:
         for variation in variations:
             if variation in self.existing_phones:
                 return True
+            if self.work_queue is not None and self.work_queue.has_phone(variation):
+                return True
         
         return False
+    
+    def claim_phone(self, phone_number):
+        """Record a new phone number. Returns False if another instance got it first"""
+        cleaned_phone = re.sub(r'[\s\-\.\(\)]', '', str(phone_number))
+        self.existing_phones.add(cleaned_phone)
+        if self.work_queue is not None:
+            return self.work_queue.add_phone(cleaned_phone)
+        return True
         
     def handle_captcha(self):
         """Handle CAPTCHA if present"""
@@ -138,17 +273,136 @@ class ClickCallScraper:
         title = self.driver.title.lower()
         if any(word in title for word in ['pardon', 'interruption', 'captcha', 'verify', 'security']):
             print("\n🚨 CAPTCHA DETECTED!")
+            self.pacer.record_error()  # The site is pushing back - slow down
             print("📱 Please solve it in the browser window")
             input("Press Enter after solving CAPTCHA...")
             return True
         return True
     
-    def find_car_listings(self, search_url):
-        """Find individual car listing URLs from ALL pages of search results"""
+    def capture_page(self, url, kind, page_source=None, live_result=None):
+        """Save a page (the current one by default) to the archive when capture mode is on"""
+        if self.page_archive is None:
+            return
+        try:
+            if page_source is None:
+                page_source = self.driver.page_source
+            self.page_archive.save(url, page_source, kind=kind, live_result=live_result)
+        except Exception as e:
+            print(f"  ⚠️ Could not archive page: {e}")
+    
+    def is_error_page(self):
+        """Check if the server answered with an error / rate-limit page instead of content"""
+        if self.driver is None:
+            return False
+        title = (self.driver.title or '').lower()
+        error_words = ['403', '429', '500', '502', '503', '504', 'too many requests',
+                       'access denied', 'service unavailable', 'bad gateway', 'gateway timeout']
+        return any(word in title for word in error_words)
+    
+    def is_dead_listing(self, car_url):
+        """
+        Check if a listing page is gone. Only positive signals count: a 404 / "removed" title,
+        or a redirect to a search / category page (what Dubizzle does with removed ads).
+        Any other URL mismatch is left to check_landed_on_listing.
+        """
+        if self.driver is None:
+            return False
+        title = (self.driver.title or '').lower()
+        dead_words = ['404', 'page not found', 'no longer available', 'ad not found',
+                      'has been removed', 'has expired', 'has been sold']
+        if any(word in title for word in dead_words):
+            return True
+        
+        current_path = urlsplit(self.driver.current_url or '').path.rstrip('/')
+        if LISTING_URL_PATTERN.search(current_path):
+            return False  # Still on a listing page
+        listing_path = urlsplit(car_url).path.rstrip('/')
+        return listing_path.startswith(current_path + '/') or '/search' in current_path
+    
+    def check_landed_on_listing(self, car_url):
+        """Record an unexplained redirect (canonical/locale URL, odd characters in the scraped URL) as structural"""
+        listing_path = urlsplit(car_url).path.rstrip('/')
+        current_url = self.driver.current_url or ''
+        if listing_path and listing_path not in current_url:
+            self.record_failure(STRUCTURAL, car_url, f"expected the listing page, landed on {current_url}")
+    
+    def load_page(self, url):
+        """Load a page through the pacing controller, feeding it latency and errors"""
+        self.pacer.wait()
+        started = time.monotonic()
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            self.pacer.record_error(timeout=True)
+            raise
+        except WebDriverException:
+            self.pacer.record_error()
+            raise
+        
+        if self.is_error_page():
+            self.pacer.record_error()
+        else:
+            self.pacer.record_success(time.monotonic() - started)
+    
+    def open_listing(self, car_url):
+        """Show a listing in the foreground tab: switch to its prefetched tab if there is one, else load it"""
+        if self.tab_pool is None or not self.tab_pool.has(car_url):
+            self.load_page(car_url)
+            return False
+        
+        try:
+            latency = self.tab_pool.activate(car_url)
+        except TimeoutException:
+            self.pacer.record_error(timeout=True)
+            raise
+        if self.is_error_page():
+            self.pacer.record_error()
+        else:
+            self.pacer.record_success(latency)
+        return True
+    
+    def prefetch_ahead(self, pending):
+        """Multi-tab mode: take the next listings off the frontier and start loading them in background tabs"""
+        if self.tab_pool is None:
+            return
+        while len(self.lookahead) < self.tab_pool.background_slots:
+            car_url = self.take_fresh_listing(pending)
+            if car_url is None:
+                break
+            self.lookahead.append(car_url)
+        
+        for car_url in self.lookahead:
+            if self.tab_pool.free_slots() <= 0:
+                break
+            if not self.tab_pool.has(car_url):
+                try:
+                    self.tab_pool.open(car_url)
+                except Exception as e:
+                    print(f"  ⚠️ Prefetch failed, will load normally: {e}")
+                    break
+    
+    def find_car_listings(self, search_url, deadline=None):
+        """
+        Find individual car listing URLs from ALL pages of search results
+        
+        If this search was crawled recently (see DiscoveryCache), only the first page(s) are
+        refreshed: as soon as a page shows listings we already know, the cached tail is reused.
+        With a deadline (time.monotonic() value), pagination stops once it has passed.
+        """
         print(f"🔍 Visiting search results: {search_url}")
         
         all_car_urls = set()
         page_num = 1
+        page_attempts = 0
+        
+        cached = self.discovery_cache.get(search_url) if self.discovery_cache else None
+        cached_pages, crawled_at = cached if cached else (None, None)
+        cached_urls = {url for page in cached_pages for url in page} if cached_pages else set()
+        if cached_pages:
+            print(f"  ♻️ Cached discovery: {len(cached_urls)} listings over {len(cached_pages)} pages")
+        fetched_pages = []
+        reuse_cache = False
+        completed = True
         
         while True:
             # Construct URL for current page
@@ -162,28 +416,22 @@ class ClickCallScraper:
             print(f"📄 Scraping page {page_num}: {current_url}")
             
             try:
-                self.driver.get(current_url)
+                self.load_page(current_url)
                 time.sleep(5)
                 
                 self.handle_captcha()
+                if self.is_error_page():
+                    raise ListingFailure(TRANSIENT, current_url, f"error page: {self.driver.title}")
                 
                 # Scroll to load content
                 for i in range(3):
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                     time.sleep(2)
                 
-                # Check if this page has any car listings
+                # Check if this page has any car listings (individual listings have a date in the URL)
                 page_source = self.driver.page_source
-                
-                # Pattern for individual car listings with date in URL
-                url_pattern = r'/motors/used-cars/[^/]+/[^/]+/\d{4}/\d{1,2}/\d{1,2}/[^"\'>\s]+'
-                matches = re.findall(url_pattern, page_source)
-                
-                page_car_urls = set()
-                for match in matches:
-                    if not match.startswith('http'):
-                        full_url = 'https://dubai.dubizzle.com' + match
-                        page_car_urls.add(full_url)
+                page_car_urls = extract_listing_urls(page_source)
+                self.capture_page(current_url, 'search', page_source=page_source)
                 
                 print(f"  ✅ Found {len(page_car_urls)} cars on page {page_num}")
                 
@@ -194,6 +442,18 @@ class ClickCallScraper:
                 
                 # Add to our collection
                 all_car_urls.update(page_car_urls)
+                fetched_pages.append(sorted(page_car_urls))
+                
+                # On a rerun, stop as soon as listings we already know about reappear
+                if page_car_urls & cached_urls:
+                    print(f"  ♻️ Known listings reappeared on page {page_num} - reusing cached pages")
+                    reuse_cache = True
+                    break
+                
+                if deadline is not None and time.monotonic() > deadline:
+                    print(f"  ⏰ Discovery time budget used up - stopping at page {page_num}")
+                    completed = False
+                    break
                 
                 # Check if there's a "Next" button (Dubizzle uses arrow-based pagination)
                 try:
@@ -238,6 +498,7 @@ class ClickCallScraper:
                     # Continue anyway, let the empty results stop us
                 
                 page_num += 1
+                page_attempts = 0
                 
                 # Safety limit to prevent infinite loops
                 if page_num > 50:
@@ -246,13 +507,48 @@ class ClickCallScraper:
                     
             except Exception as e:
                 print(f"❌ Error on page {page_num}: {e}")
-                break
+                kind = classify_failure(e)
+                self.record_failure(kind, current_url, e)
+                
+                # Only transient errors are worth another go at the same page
+                page_attempts += 1
+                if kind != TRANSIENT or page_attempts > config.MAX_RETRIES:
+                    completed = False
+                    break
+                
+                if is_session_dead(e):
+                    self.restart_driver()
+                delay = backoff_delay(page_attempts, config.RETRY_BASE_DELAY, config.RETRY_MAX_DELAY)
+                print(f"🔁 Retrying page {page_num} ({page_attempts}/{config.MAX_RETRIES}) in {delay:.0f}s...")
+                time.sleep(delay)
+        
+        if reuse_cache:
+            for cached_page in cached_pages:
+                tail = [url for url in cached_page if url not in all_car_urls]
+                if tail:
+                    fetched_pages.append(tail)
+                    all_car_urls.update(tail)
+            print(f"  ♻️ Reused cached pages: {len(all_car_urls)} listings after {page_num} page load(s)")
+        
+        # Only cache a full picture of the search, not one cut short by errors or the deadline
+        if self.discovery_cache and completed and fetched_pages:
+            try:
+                # A refresh that reused the cached tail is only as fresh as the crawl that fetched it
+                self.discovery_cache.put(search_url, fetched_pages, crawled_at=crawled_at if reuse_cache else None)
+            except OSError as e:
+                print(f"  ⚠️ Could not save discovery cache: {e}")
         
         print(f"🎉 TOTAL FOUND: {len(all_car_urls)} individual car listings across {page_num-1} pages")
         return list(all_car_urls)
     
-    def get_real_phone_number(self, car_url):
-        """Visit car page and click call button to get REAL phone number"""
+    def get_real_phone_number(self, car_url, already_loaded=False):
+        """
+        Visit car page and click call button to get REAL phone number
+        
+        Raises ListingFailure for transient failures (to be retried) and dead listings
+        (to be dropped). Structural failures are counted and the partial record is returned.
+        With already_loaded=True the listing is expected to be open in the foreground tab already.
+        """
         result = {
             'URL': car_url,
             'Title': '',
@@ -266,10 +562,16 @@ class ClickCallScraper:
         
         try:
             print(f"\n🚗 Visiting: {car_url}")
-            self.driver.get(car_url)
-            time.sleep(4)
+            if not already_loaded:
+                self.load_page(car_url)
+                time.sleep(4)
             
             self.handle_captcha()
+            if self.is_error_page():
+                raise ListingFailure(TRANSIENT, car_url, f"error page: {self.driver.title}")
+            if self.is_dead_listing(car_url):
+                raise ListingFailure(DEAD_LISTING, car_url, "listing removed")
+            self.check_landed_on_listing(car_url)
             
             # Extract basic info
             result['Title'] = self.get_title()
@@ -308,9 +610,19 @@ class ClickCallScraper:
                     
             else:
                 print("❌ Could not find or click call button")
+                self.record_failure(STRUCTURAL, car_url, "no call button")
             
+            # Archive the post-reveal page for offline re-extraction (replay.py)
+            self.capture_page(car_url, 'listing', live_result=result)
+            
+        except ListingFailure:
+            raise
         except Exception as e:
             print(f"❌ Error processing {car_url}: {e}")
+            kind = classify_failure(e)
+            if kind != STRUCTURAL:
+                raise ListingFailure(kind, car_url, e) from e
+            self.record_failure(kind, car_url, e)
         
         return result
     
@@ -443,25 +755,9 @@ class ClickCallScraper:
     def find_visible_phone(self):
         """Find any phone number currently visible on the page"""
         try:
-            page_text = self.driver.page_source
-            
-            # Phone patterns
-            patterns = [
-                r'\+971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-                r'971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-                r'0\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-                r'\b\d{10,11}\b'
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, page_text)
-                if matches:
-                    return matches[0]
-                    
+            return find_phone(self.driver.page_source)
         except:
-            pass
-        
-        return ''
+            return ''
     
     def extract_phone_after_click(self, wait_time=5):
         """Extract phone number that appears after clicking call button"""
@@ -472,69 +768,39 @@ class ClickCallScraper:
             
             try:
                 # Method 1: Look for popup/modal phone numbers (this is where the real numbers appear)
-                popup_selectors = [
-                    '[role="dialog"] *',  # Inside dialog
-                    '.modal *',  # Inside modal
-                    '[class*="modal"] *',  # Inside any modal class
-                    '[class*="popup"] *',  # Inside any popup class
-                    '[class*="phone"] *',  # Inside phone-related classes
-                    '[data-testid*="phone"] *',  # Inside phone test elements
-                ]
-                
-                for selector in popup_selectors:
+                for selector in POPUP_SELECTORS:
                     try:
                         elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                         for element in elements:
                             if element.is_displayed():
                                 text = element.text.strip()
                                 # Look for UAE phone numbers in popup
-                                phone_match = re.search(r'\+971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}', text)
-                                if phone_match:
-                                    phone = phone_match.group(0)
+                                phone = find_uae_phone(text)
+                                if phone:
                                     print(f"🎉 Found phone in popup: {phone}")
                                     return phone
                     except:
                         continue
                 
                 # Method 2: Look for any new phone numbers that appeared after clicking
-                all_text = self.driver.page_source
-                uae_phones = re.findall(r'\+971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}', all_text)
-                
-                if uae_phones:
-                    # Return the first UAE format phone (most likely to be real)
-                    phone = uae_phones[0]
+                # Return the first UAE format phone (most likely to be real)
+                phone = find_uae_phone(self.driver.page_source)
+                if phone:
                     print(f"🎉 Found UAE format phone: {phone}")
                     return phone
                 
                 # Method 3: Look for phone number containers that might have updated
-                phone_containers = [
-                    '[class*="phone"]',
-                    '[data-testid*="phone"]',
-                    '[class*="contact"]',
-                    '[data-testid*="contact"]'
-                ]
-                
-                for selector in phone_containers:
+                for selector in PHONE_CONTAINER_SELECTORS:
                     try:
                         elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                         for element in elements:
                             if element.is_displayed():
                                 text = element.text.strip()
-                                # Look for any phone pattern
-                                phone_patterns = [
-                                    r'\+971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-                                    r'971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}',
-                                    r'0\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}'
-                                ]
-                                
-                                for pattern in phone_patterns:
-                                    phone_match = re.search(pattern, text)
-                                    if phone_match:
-                                        phone = phone_match.group(0)
-                                        # Skip obvious fake numbers
-                                        if not re.match(r'^0+$', phone.replace('+', '').replace('-', '').replace(' ', '').replace('.', '')):
-                                            print(f"🎉 Found phone in container: {phone}")
-                                            return phone
+                                # Look for any phone pattern (skipping obvious fake numbers)
+                                phone = find_container_phone(text)
+                                if phone:
+                                    print(f"🎉 Found phone in container: {phone}")
+                                    return phone
                     except:
                         continue
                 
@@ -547,12 +813,11 @@ class ClickCallScraper:
     
     def get_title(self):
         """Extract title"""
-        selectors = ['h1', '[class*="title"]']
-        for selector in selectors:
+        for selector in TITLE_SELECTORS:
             try:
                 element = self.driver.find_element(By.CSS_SELECTOR, selector)
                 text = element.text.strip()
-                if text and len(text) > 5:
+                if is_title(text):
                     return text
             except:
                 continue
@@ -560,19 +825,23 @@ class ClickCallScraper:
     
     def get_price(self):
         """Extract price"""
-        selectors = ['[data-testid="listing-price"]', '[class*="price"]']
-        for selector in selectors:
+        for selector in PRICE_SELECTORS:
             try:
                 element = self.driver.find_element(By.CSS_SELECTOR, selector)
                 text = element.text.strip()
-                if text and ('aed' in text.lower() or any(c.isdigit() for c in text)):
+                if is_price(text):
                     return text
             except:
                 continue
         return ''
     
-    def scrape_with_real_phones(self, search_url, max_cars=10):
-        """Main scraping method focusing on real phone numbers"""
+    def scrape_with_real_phones(self, search_url, max_cars=10, max_duration=None):
+        """
+        Main scraping method focusing on real phone numbers
+        
+        max_duration (seconds) bounds the whole run: newest listings are processed first and the
+        run stops, keeping its results, when the next car is not expected to finish in time.
+        """
         print("🚀 CLICK CALL BUTTON SCRAPER")
         print("🎯 Focus: Getting REAL phone numbers by clicking call buttons")
         print("🔄 Duplicate Detection: Skip listings with existing phone numbers")
@@ -581,73 +850,142 @@ class ClickCallScraper:
         filename = "Dubizzle Data.xlsx"
         self.load_existing_phone_numbers(filename)
         
+        if max_duration is None:
+            max_duration = config.MAX_RUN_SECONDS
+        self.budget = RunBudget(max_duration, initial_estimate=config.EXPECTED_SECONDS_PER_CAR)
+        if max_duration:
+            print(f"⏰ Time budget: {max_duration:.0f}s")
+        
         self.setup_driver()
+        retry_queue = RetryQueue.from_config()
+        stopped_by_deadline = False
         
         try:
             # Find car listings
-            car_urls = self.find_car_listings(search_url)
+            discovery_started = time.monotonic()
+            car_urls = self.find_car_listings(search_url, deadline=self.budget.deadline(config.DISCOVERY_BUDGET_SHARE))
+            processing_started = time.monotonic()
+            self.run_stats = {'discovery_seconds': processing_started - discovery_started}
             
-            if not car_urls:
+            # Newest postings first - they are the most likely to still be live and unseen
+            car_urls = sorted(car_urls, key=listing_priority, reverse=True)
+            total_found = len(car_urls)
+            if self.work_queue is not None:
+                # Other instances may have discovered (and be working on) the same listings.
+                # From here on the queue (on disk) holds the frontier, not this list.
+                added = self.work_queue.enqueue(car_urls, {url: listing_priority(url) for url in car_urls})
+                print(f"📥 Queue: {added} new listings added, {self.work_queue.pending_count()} waiting")
+                pending = None
+                car_urls = None
+            elif not car_urls:
                 print("❌ No car listings found")
                 return
+            else:
+                pending = deque(car_urls)
             
-            print(f"\n📋 Processing up to {max_cars} cars from {len(car_urls)} found")
+            print(f"\n📋 Processing up to {max_cars} cars from {total_found} found")
             
             processed_count = 0
             skipped_count = 0
+            checked_count = 0
             
-            # Process each car
-            for i, car_url in enumerate(car_urls, 1):
+            # Process each car, then whatever transient failures were deferred
+            full_car = False  # whether the previous car went through full processing (for the time estimate)
+            while True:
+                self.budget.mark(full=full_car)
+                full_car = False
+                if not self.budget.can_fit():
+                    print(f"\n⏰ Time budget reached: {self.budget.remaining():.0f}s left, "
+                          f"~{self.budget.estimate:.0f}s per car - stopping with {processed_count} new cars")
+                    stopped_by_deadline = True
+                    break
+                
+                car_url, is_retry = self.next_listing(pending, retry_queue)
+                if car_url is None:
+                    break
+                checked_count += 1
+                if checked_count > 1 and self.budget.max_duration is not None:
+                    print(f"⏱️ {self.budget.elapsed():.0f}s elapsed, {self.budget.remaining():.0f}s left "
+                          f"(~{self.budget.estimate:.0f}s per car, room for ~{self.budget.cars_left()} more)")
+                
+                if self.streaming:
+                    self.recycle_browser_if_needed()
+                
                 print(f"\n{'='*80}")
-                print(f"🚗 CHECKING CAR {i}/{len(car_urls)}")
+                if is_retry:
+                    print(f"🔁 RETRYING CAR: {car_url}")
+                else:
+                    print(f"🚗 CHECKING CAR {checked_count}/{total_found}")
                 print(f"{'='*80}")
                 
-                # First, do a quick check to see if we can get the phone number without processing
                 try:
-                    print(f"🔍 Quick phone check: {car_url}")
-                    self.driver.get(car_url)
-                    time.sleep(3)
-                    
-                    # Get the initial phone number visible on page
-                    initial_phone = self.find_visible_phone()
-                    
-                    # Check if this phone (or the real one) might be a duplicate
-                    if initial_phone and self.is_phone_duplicate(initial_phone):
-                        print(f"📞 Initial phone found: {initial_phone}")
-                        print(f"⏭️  SKIPPING: Phone number already exists in database")
-                        skipped_count += 1
-                        continue
-                    
-                    # If we have fewer than processed limit, continue with full processing
-                    if processed_count >= max_cars:
-                        print(f"✅ Reached processing limit of {max_cars} new cars")
-                        break
+                    # First, do a quick check to see if we can get the phone number without processing
+                    try:
+                        print(f"🔍 Quick phone check: {car_url}")
+                        if not self.open_listing(car_url):
+                            time.sleep(3)
+                        
+                        # Overlap the next listings' page loads with this one's click/reveal work
+                        self.prefetch_ahead(pending)
+                        
+                        if self.is_error_page():
+                            raise ListingFailure(TRANSIENT, car_url, f"error page: {self.driver.title}")
+                        if self.is_dead_listing(car_url):
+                            raise ListingFailure(DEAD_LISTING, car_url, "listing removed")
                         
-                    print(f"🔄 PROCESSING CAR {processed_count + 1} (NEW)")
+                        # Get the initial phone number visible on page
+                        initial_phone = self.find_visible_phone()
+                        
+                        # Check if this phone (or the real one) might be a duplicate
+                        if initial_phone and self.is_phone_duplicate(initial_phone):
+                            print(f"📞 Initial phone found: {initial_phone}")
+                            print(f"⏭️  SKIPPING: Phone number already exists in database")
+                            skipped_count += 1
+                            self.finish_listing(car_url)
+                            continue
+                        
+                        # If we have fewer than processed limit, continue with full processing
+                        if processed_count >= max_cars:
+                            print(f"✅ Reached processing limit of {max_cars} new cars")
+                            if self.work_queue is not None:
+                                self.work_queue.release(car_url)
+                            break
+                            
+                        print(f"🔄 PROCESSING CAR {processed_count + 1} (NEW)")
+                        
+                    except ListingFailure:
+                        raise
+                    except Exception as e:
+                        print(f"⚠️ Error during quick check: {e}")
+                        if classify_failure(e) == TRANSIENT:
+                            raise ListingFailure(TRANSIENT, car_url, e) from e
+                        # Continue with full processing anyway
                     
-                except Exception as e:
-                    print(f"⚠️ Error during quick check: {e}")
-                    # Continue with full processing anyway
+                    # Full processing
+                    # (with tabs the listing is already open in the foreground - no need to reload it)
+                    full_car = True
+                    car_data = self.get_real_phone_number(car_url, already_loaded=self.tab_pool is not None)
+                    
+                except ListingFailure as failure:
+                    self.handle_listing_failure(failure, retry_queue)
+                    continue
                 
-                # Full processing
-                car_data = self.get_real_phone_number(car_url)
+                self.finish_listing(car_url)
                 
-                # Check if the real phone number is a duplicate
-                if car_data['Real_Phone_Number'] and self.is_phone_duplicate(car_data['Real_Phone_Number']):
-                    print(f"⏭️  SKIPPING: Real phone {car_data['Real_Phone_Number']} already exists")
+                # Check if the real phone number is a duplicate (here, or just found by another instance)
+                real_phone = car_data['Real_Phone_Number']
+                if real_phone and (self.is_phone_duplicate(real_phone) or not self.claim_phone(real_phone)):
+                    print(f"⏭️  SKIPPING: Real phone {real_phone} already exists")
                     skipped_count += 1
                     continue
                 
                 # Add to our data if it's new
-                self.scraped_data.append(car_data)
+                self.store_result(car_data)
                 processed_count += 1
                 
                 # Show results
-                if car_data['Real_Phone_Number']:
-                    print(f"🎉 SUCCESS: New phone = {car_data['Real_Phone_Number']}")
-                    # Add to existing phones set to avoid duplicates within this session
-                    cleaned_phone = re.sub(r'[\s\-\.\(\)]', '', str(car_data['Real_Phone_Number']))
-                    self.existing_phones.add(cleaned_phone)
+                if real_phone:
+                    print(f"🎉 SUCCESS: New phone = {real_phone}")
                 else:
                     print(f"❌ FAILED: No real phone number obtained")
                 
@@ -655,30 +993,106 @@ class ClickCallScraper:
                 if processed_count >= max_cars:
                     print(f"✅ Reached processing limit of {max_cars} new cars")
                     break
-                
-                # Delay between cars
-                delay = random.uniform(6, 10)
-                print(f"⏳ Waiting {delay:.1f} seconds...")
-                time.sleep(delay)
+            
+            processing_seconds = time.monotonic() - processing_started
+            self.run_stats.update({
+                'processing_seconds': processing_seconds,
+                'checked': checked_count,
+                'processed': processed_count,
+                'seconds_per_car': processing_seconds / checked_count if checked_count else 0.0,
+                'stopped_by_deadline': stopped_by_deadline,
+            })
             
             print(f"\n🎉 Scraping completed!")
             print(f"📊 Summary:")
-            print(f"  - Total cars checked: {i}")
+            print(f"  - Total cars checked: {checked_count}")
             print(f"  - New cars processed: {processed_count}")
             print(f"  - Duplicates skipped: {skipped_count}")
+            print(f"  - Processing time: {processing_seconds:.0f}s ({self.run_stats['seconds_per_car']:.1f}s per car, {self.tabs} tab(s))")
+            print(f"  - Page loads: {self.pacer.successes} ok, {self.pacer.errors} errors (final delay {self.pacer.delay:.1f}s)")
+            print(f"  - Retries used: {retry_queue.retries_used}/{retry_queue.budget}")
+            if stopped_by_deadline:
+                print(f"  - Stopped early: time budget of {self.budget.max_duration:.0f}s reached")
+            self.print_failure_summary()
             
         except Exception as e:
             print(f"❌ Error: {e}")
         finally:
+            # Hand unfinished retries back so another instance can pick them up
+            if self.work_queue is not None:
+                for car_url in list(self.lookahead) + retry_queue.drain():
+                    self.work_queue.release(car_url)
+            self.lookahead.clear()
+            self.close_frontier()
+            if self.spool is not None:
+                self.spool.flush()
             if self.driver:
                 self.driver.quit()
     
+    def take_fresh_listing(self, pending):
+        """Next not-yet-tried listing from the shared queue or the local list, or None"""
+        if self.work_queue is not None:
+            return self.work_queue.claim()
+        if pending:
+            return pending.popleft()
+        return None
+    
+    def next_listing(self, pending, retry_queue):
+        """Next listing to process as (url, is_retry): prefetched/fresh listings first, then due retries"""
+        if self.lookahead:
+            return self.lookahead.popleft(), False
+        
+        car_url = self.take_fresh_listing(pending)
+        if car_url:
+            return car_url, False
+        
+        if retry_queue:
+            # Don't sit out a backoff that would leave no time to actually retry
+            if not self.budget.can_fit(extra_wait=retry_queue.next_ready_in()):
+                print(f"⏰ Not waiting for {len(retry_queue)} deferred retries - no time left for them")
+                return None, False
+            return retry_queue.pop_ready(wait=True), True
+        return None, False
+    
+    def finish_listing(self, car_url):
+        """Mark a listing as done in the shared queue"""
+        if self.work_queue is not None:
+            self.work_queue.ack(car_url)
+    
+    def handle_listing_failure(self, failure, retry_queue):
+        """Count a listing failure, restart a dead browser and defer transient failures for retry"""
+        self.record_failure(failure.kind, failure.url, failure.cause)
+        
+        if failure.session_dead:
+            self.restart_driver()
+        
+        if failure.kind == TRANSIENT and retry_queue.defer(failure.url):
+            return  # Still ours - keep the lease while we wait to retry
+        
+        if failure.kind == TRANSIENT:
+            print(f"🛑 Giving up on {failure.url} (retry limit reached)")
+        elif failure.kind == DEAD_LISTING:
+            print(f"🪦 Dropping dead listing: {failure.url}")
+        self.finish_listing(failure.url)
+    
+    def print_failure_summary(self):
+        """Print failure counts per class for this run"""
+        print(f"  - Failures:")
+        for kind in FAILURE_CLASSES:
+            print(f"      {kind}: {self.failure_counts[kind]}")
+    
     def save_results(self, filename='real_phone_numbers.xlsx'):
         """Save results to Excel with multiple sheets: Master Data + New Numbers Only"""
+        if self.spool is not None:
+            self.save_streamed_results(filename)
+            return
+        
         if not self.scraped_data:
             print("❌ No new data to save")
             return
         
+        import pandas as pd
+        
         new_df = pd.DataFrame(self.scraped_data)
         
         # Check if file exists and has data
@@ -756,9 +1170,41 @@ class ClickCallScraper:
             for _, row in new_df[new_df['Real_Phone_Number'] != ''].iterrows():
                 print(f"  {row['Real_Phone_Number']} - {row['Title'][:50]}...")
 
+    def save_streamed_results(self, filename):
+        """Streaming-mode save: build the workbook row by row from the spool, without pandas"""
+        if not len(self.spool):
+            print("❌ No new data to save")
+            self.spool.remove()
+            return
+        
+        print(f"💾 Writing {len(self.spool)} spooled records to {filename}...")
+        stats = write_streamed_workbook(filename, self.spool)
+        total_records = stats['existing'] + stats['new']
+        
+        print(f"\n✅ RESULTS SAVED TO {filename}")
+        print(f"📊 WORKBOOK CONTAINS:")
+        print(f"  📑 'Master Data' sheet: {total_records} total records")
+        print(f"  🆕 'New Numbers Only' sheet: {stats['new']} new records")
+        if stats['new_phones'] > 0:
+            print(f"  📞 'New Phones Summary' sheet: {stats['new_phones']} new phone numbers")
+        
+        print(f"\n📊 SESSION SUMMARY:")
+        print(f"  - New cars processed: {stats['new']}")
+        print(f"  - New call buttons clicked: {stats['new_buttons_clicked']}")
+        print(f"  - New real phone numbers: {stats['new_phones']}")
+        print(f"  - Session success rate: {(stats['new_phones']/stats['new']*100):.1f}%")
+        
+        print(f"\n📈 TOTAL DATABASE:")
+        print(f"  - Total records: {total_records}")
+        print(f"  - Total real phone numbers: {stats['total_phones']}")
+        
+        self.spool.remove()
+
 
 def main():
     """Main function"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     print("🚀 CLICK CALL BUTTON SCRAPER WITH DUPLICATE DETECTION & MULTI-SHEET EXCEL")
     print("="*80)
     print("🎯 This scraper will:")
@@ -786,20 +1232,38 @@ def main():
     else:
         max_cars = int(max_cars) if max_cars.isdigit() else 999999
     
+    max_minutes = input("Time limit in minutes? [none]: ").strip()
+    max_duration = float(max_minutes) * 60 if max_minutes.replace('.', '', 1).isdigit() and float(max_minutes) > 0 else None
+    if max_duration:
+        print(f"⏰ Will stop after about {max_minutes} minutes (newest listings first) and save what it has")
+    
+    # Unlimited runs stream results to disk so memory stays flat however many listings there are
+    streaming = max_cars == 999999
+    if streaming:
+        print(f"🌊 Streaming mode: results flushed every {config.STREAM_BATCH_SIZE} cars, browser recycled above {config.BROWSER_RSS_LIMIT_MB} MB")
+    
     # Always use the same filename
     filename = "Dubizzle Data.xlsx"
     print(f"\n📁 Results will be saved to: {filename}")
     
-    scraper = ClickCallScraper(headless=False)
+    work_queue = open_work_queue(config.WORK_QUEUE_URL, lease_seconds=config.WORK_QUEUE_LEASE_SECONDS,
+                                 crawl=normalize_search_url(url))
+    if work_queue:
+        print(f"🤝 Sharing the crawl through work queue: {config.WORK_QUEUE_URL}")
+    
+    scraper = ClickCallScraper(headless=False, work_queue=work_queue, streaming=streaming)
     
     try:
-        scraper.scrape_with_real_phones(url, max_cars)
+        scraper.scrape_with_real_phones(url, max_cars, max_duration=max_duration)
         scraper.save_results(filename)
         
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
-        if scraper.scraped_data:
+        if scraper.result_count:
             scraper.save_results(filename)
+    finally:
+        if work_queue:
+            work_queue.close()
 
 
 if __name__ == "__main__":
@@ -2,16 +2,59 @@
 Configuration file for Dubizzle scraper
 """
 
+import os
+
 # Scraping settings
-DELAY_BETWEEN_REQUESTS = 3  # seconds
+DELAY_BETWEEN_REQUESTS = 3  # seconds (starting point, adapted at runtime)
+MIN_DELAY_BETWEEN_REQUESTS = 2  # seconds - never go faster than this
+MAX_DELAY_BETWEEN_REQUESTS = 60 # seconds - back-off cap
+MAX_REQUESTS_PER_MINUTE = 12    # hard politeness ceiling on page loads
+TARGET_PAGE_LOAD_SECONDS = 6    # loads slower than this count as the site struggling
 DELAY_BETWEEN_PAGES = 5     # seconds
 DELAY_AFTER_PHONE_CLICK = 2 # seconds
-MAX_RETRIES = 3
-TIMEOUT = 10
+MAX_RETRIES = 3     # retries per listing / search page for transient failures
+RETRY_BUDGET = 30   # total listing retries allowed per run
+RETRY_BASE_DELAY = 10   # seconds, doubled on every retry
+RETRY_MAX_DELAY = 120   # seconds
+TIMEOUT = 30        # page load timeout (seconds)
+
+# Shared work queue (for several app instances crawling together)
+# '' = off, 'sqlite:///work_queue.db' = shared SQLite file, 'redis://host:6379/0' = Redis
+WORK_QUEUE_URL = os.environ.get('WORK_QUEUE_URL', '')
+WORK_QUEUE_LEASE_SECONDS = 900  # claimed listings go back to the queue if not acked within this
+
+# Search discovery cache - reruns of the same search only refresh the first page(s)
+DISCOVERY_CACHE_DIR = "discovery_cache"
+DISCOVERY_CACHE_TTL = 6 * 3600  # seconds, 0 disables the cache
+
+# Capture mode - archive every page (gzipped HTML) for offline re-extraction with replay.py
+CAPTURE_DIR = os.environ.get('CAPTURE_DIR', '')  # '' = off
+
+# Streaming mode (used for unlimited "ALL" runs) - keeps memory flat on long runs
+STREAM_SPOOL_DIR = "stream_spool"  # batches of results + the on-disk frontier
+STREAM_BATCH_SIZE = 50             # results held in memory before flushing to disk
+BROWSER_RSS_LIMIT_MB = 1500        # restart Chrome once it grows past this
+
+# Web service job scheduling (per app process - run gunicorn with a single worker process)
+MAX_CONCURRENT_JOBS = 1    # Chrome instances running at once
+MAX_QUEUED_JOBS = 5        # jobs waiting beyond that; more get 429 + Retry-After
+JOBS_DIR = "jobs"          # each job writes to jobs/<job_id>/results.xlsx
+KEEP_FINISHED_JOBS = 50    # older finished jobs (and their files) are cleaned up
+DEFAULT_JOB_SECONDS = 600  # initial guess of job duration for queue ETAs
+
+# Deadline-aware runs - listings are processed newest first and the run stops cleanly
+# (saving what it has) when the next car is not expected to fit in the time budget
+MAX_RUN_SECONDS = None          # default wall-clock budget per run, None = no limit
+EXPECTED_SECONDS_PER_CAR = 30   # starting estimate, replaced by measured per-car time
+DISCOVERY_BUDGET_SHARE = 0.3    # at most this share of the budget is spent paginating the search
+
+# Query API index over the Master Data history (rebuilt when the workbook changes)
+PHONE_INDEX_PATH = "phone_index.db"
 
 # Browser settings
 HEADLESS_MODE = False  # Set to True to run browser in background
 WINDOW_SIZE = "1920,1080"
+BROWSER_TABS = 1       # >1 = load the next listings in background tabs of the same browser
 
 # Excel settings
 EXCEL_FILENAME = "dubizzle_cars_data.xlsx"
@@ -0,0 +1,86 @@
+"""
+TTL cache of search-result discovery
+Stores the listing URLs found on each results page, keyed by the normalized search URL,
+so a rerun of the same search only has to refresh the first page(s).
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_search_url(url: str) -> str:
+    """Canonical form of a search URL: lowercase host, sorted query params, no `page`, no fragment"""
+    parts = urlsplit(url.strip())
+    params = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if key != 'page')
+    path = parts.path.rstrip('/') + '/'
+    return urlunsplit((parts.scheme.lower() or 'https', parts.netloc.lower(), path, urlencode(params), ''))
+
+
+class DiscoveryCache:
+    """
+    One JSON file per normalized search URL:
+    {"search_url": ..., "saved_at": <unix time>, "crawled_at": <unix time>,
+     "pages": [[listing urls of page 1], [page 2], ...]}
+    crawled_at is when every page was last fetched; a rerun that refreshes only the first
+    page(s) and reuses the rest keeps it, so the TTL (measured from crawled_at) still forces
+    a full re-crawl however often the search is rerun.
+    """
+    def __init__(self, directory: str = 'discovery_cache', ttl_seconds: float = 6 * 3600):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_config(cls):
+        """Build the cache from config.py, or None if it is disabled"""
+        import config
+        if not config.DISCOVERY_CACHE_TTL:
+            return None
+        return cls(directory=config.DISCOVERY_CACHE_DIR, ttl_seconds=config.DISCOVERY_CACHE_TTL)
+
+    def _path(self, search_url):
+        key = hashlib.sha1(normalize_search_url(search_url).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, search_url: str) -> Optional[Tuple[List[List[str]], float]]:
+        """(cached pages, crawled_at) for this search, or None if missing or expired"""
+        try:
+            with open(self._path(search_url), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        crawled_at = entry.get('crawled_at', entry.get('saved_at', 0))
+        if time.time() - crawled_at > self.ttl_seconds or not entry.get('pages'):
+            return None
+        return entry['pages'], crawled_at
+
+    def put(self, search_url: str, pages: List[List[str]], crawled_at: Optional[float] = None):
+        """
+        Store the pages for this search (written atomically).
+        Pass the crawled_at from get() when part of the pages was reused from the cache.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(search_url)
+        now = time.time()
+        entry = {
+            'search_url': normalize_search_url(search_url),
+            'saved_at': now,
+            'crawled_at': crawled_at or now,
+            'pages': pages,
+        }
+        # Unique temp file - concurrent jobs on the same search run as threads of one process
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=os.path.basename(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
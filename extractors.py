@@ -0,0 +1,182 @@
+"""
+Extraction logic for Dubizzle pages that works on plain HTML/text
+Shared by the live scraper (fed from the driver) and replay.py (fed from archived pages).
+"""
+
+import re
+from datetime import date
+from typing import Optional, Set
+
+BASE_URL = 'https://dubai.dubizzle.com'
+
+# Individual car listings have the posting date in the URL path
+LISTING_URL_PATTERN = re.compile(r'/motors/used-cars/[^/]+/[^/]+/\d{4}/\d{1,2}/\d{1,2}/[^"\'>\s]+')
+
+UAE_PHONE_PATTERN = re.compile(r'\+971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}')
+
+# Any phone visible on the page (before clicking), most specific first
+VISIBLE_PHONE_PATTERNS = [
+    UAE_PHONE_PATTERN,
+    re.compile(r'971[\s\-\.]?\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}'),
+    re.compile(r'0\d{1,2}[\s\-\.]?\d{3}[\s\-\.]?\d{4}'),
+    re.compile(r'\b\d{10,11}\b'),
+]
+
+# Phones inside phone/contact containers after clicking
+CONTAINER_PHONE_PATTERNS = VISIBLE_PHONE_PATTERNS[:3]
+
+# Popups/modals where the real number shows up after clicking
+POPUP_SELECTORS = [
+    '[role="dialog"] *',  # Inside dialog
+    '.modal *',  # Inside modal
+    '[class*="modal"] *',  # Inside any modal class
+    '[class*="popup"] *',  # Inside any popup class
+    '[class*="phone"] *',  # Inside phone-related classes
+    '[data-testid*="phone"] *',  # Inside phone test elements
+]
+
+PHONE_CONTAINER_SELECTORS = [
+    '[class*="phone"]',
+    '[data-testid*="phone"]',
+    '[class*="contact"]',
+    '[data-testid*="contact"]'
+]
+
+TITLE_SELECTORS = ['h1', '[class*="title"]']
+PRICE_SELECTORS = ['[data-testid="listing-price"]', '[class*="price"]']
+
+
+def extract_listing_urls(page_source: str) -> Set[str]:
+    """Absolute listing URLs found in a search results page"""
+    urls = set()
+    for match in LISTING_URL_PATTERN.findall(page_source):
+        if not match.startswith('http'):
+            urls.add(BASE_URL + match)
+    return urls
+
+
+def find_phone(text: str) -> str:
+    """First phone number in text, trying the most specific pattern first"""
+    for pattern in VISIBLE_PHONE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+    return ''
+
+
+def find_uae_phone(text: str) -> Optional[str]:
+    """First +971 number in text"""
+    match = UAE_PHONE_PATTERN.search(text)
+    return match.group(0) if match else None
+
+
+def find_container_phone(text: str) -> Optional[str]:
+    """Phone number in a phone/contact container, skipping obvious fakes like 000-0000"""
+    for pattern in CONTAINER_PHONE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            phone = match.group(0)
+            if not re.match(r'^0+$', phone.replace('+', '').replace('-', '').replace(' ', '').replace('.', '')):
+                return phone
+    return None
+
+
+def is_title(text: str) -> bool:
+    return bool(text) and len(text) > 5
+
+
+def is_price(text: str) -> bool:
+    return bool(text) and ('aed' in text.lower() or any(c.isdigit() for c in text))
+
+
+LISTING_PATH_PATTERN = re.compile(r'/motors/used-cars/([^/]+)/([^/]+)/(\d{4})/(\d{1,2})/(\d{1,2})/')
+
+
+def parse_listing_url(url: str):
+    """(make, model, 'YYYY-MM-DD' posting date) from a listing URL, or (None, None, None)"""
+    match = LISTING_PATH_PATTERN.search(url or '')
+    if not match:
+        return None, None, None
+    make, model, year, month, day = match.groups()
+    return make.lower(), model.lower(), f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+
+def listing_priority(url: str) -> int:
+    """Scheduling priority of a listing: newer postings first (date ordinal, 0 if the URL has no date)"""
+    listed_date = parse_listing_url(url)[2]
+    if not listed_date:
+        return 0
+    try:
+        return date.fromisoformat(listed_date).toordinal()
+    except ValueError:
+        return 0
+
+
+def normalize_phone(phone: str) -> str:
+    """Canonical digits-only UAE number (971XXXXXXXXX) used for indexing and lookups"""
+    digits = re.sub(r'\D', '', str(phone or ''))
+    if digits.startswith('00971'):
+        digits = digits[2:]
+    elif digits.startswith('0') and not digits.startswith('00'):
+        digits = '971' + digits[1:]
+    elif len(digits) == 9 and digits.startswith('5'):
+        digits = '971' + digits  # bare mobile number, e.g. 548888760 stored as a number in Excel
+    return digits
+
+
+def parse_price(text: str) -> Optional[int]:
+    """'AED 45,000' -> 45000"""
+    digits = re.sub(r'[^\d]', '', str(text or '').split('.')[0])
+    return int(digits) if digits else None
+
+
+# --- Offline versions of the driver-based extraction (need beautifulsoup4) ---
+
+def parse_html(html: str):
+    """Parse HTML with BeautifulSoup (lxml if available)"""
+    from bs4 import BeautifulSoup
+    try:
+        return BeautifulSoup(html, 'lxml')
+    except Exception:
+        return BeautifulSoup(html, 'html.parser')
+
+
+def _first_text(soup, selectors, accept):
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element is not None:
+            text = element.get_text(' ', strip=True)
+            if accept(text):
+                return text
+    return ''
+
+
+def extract_title(soup) -> str:
+    """Same selectors and checks as ClickCallScraper.get_title"""
+    return _first_text(soup, TITLE_SELECTORS, is_title)
+
+
+def extract_price(soup) -> str:
+    """Same selectors and checks as ClickCallScraper.get_price"""
+    return _first_text(soup, PRICE_SELECTORS, is_price)
+
+
+def extract_revealed_phone(soup, html: str) -> Optional[str]:
+    """Same search order as ClickCallScraper.extract_phone_after_click, on a post-reveal page"""
+    for selector in POPUP_SELECTORS:
+        for element in soup.select(selector):
+            phone = find_uae_phone(element.get_text(' ', strip=True))
+            if phone:
+                return phone
+
+    phone = find_uae_phone(html)
+    if phone:
+        return phone
+
+    for selector in PHONE_CONTAINER_SELECTORS:
+        for element in soup.select(selector):
+            phone = find_container_phone(element.get_text(' ', strip=True))
+            if phone:
+                return phone
+    return None
+
@@ -0,0 +1,148 @@
+"""
+Failure classification and deferred retries for the Dubizzle scraper
+"""
+
+import time
+import random
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import (
+    TimeoutException,
+    StaleElementReferenceException,
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    WebDriverException,
+)
+
+# Failure classes
+TRANSIENT = 'transient'        # timeouts, stale elements, renderer crashes, dead sessions - worth retrying
+STRUCTURAL = 'structural'      # page loaded but didn't look like we expected - retrying won't help
+DEAD_LISTING = 'dead_listing'  # listing removed / 404 - drop it
+
+FAILURE_CLASSES = [TRANSIENT, STRUCTURAL, DEAD_LISTING]
+
+# WebDriverException messages that mean the browser session is gone
+SESSION_DEAD_MARKERS = [
+    'invalid session id', 'session deleted', 'chrome not reachable',
+    'disconnected', 'no such window', 'target window already closed',
+    'session not created',
+]
+
+# WebDriverException messages that are worth another try
+TRANSIENT_MARKERS = SESSION_DEAD_MARKERS + [
+    'timed out', 'timeout', 'renderer', 'tab crashed', 'net::err_',
+    'connection refused', 'connection reset', 'stale element',
+]
+
+
+class ListingFailure(Exception):
+    """Raised when a listing (or search page) could not be processed"""
+    def __init__(self, kind: str, url: str, cause: Optional[BaseException] = None):
+        super().__init__(f"{kind}: {url} ({cause})")
+        self.kind = kind
+        self.url = url
+        self.cause = cause
+        self.session_dead = cause is not None and is_session_dead(cause)
+
+
+def is_session_dead(exc: BaseException) -> bool:
+    """Check if an exception means the browser session has died and needs a restart"""
+    if isinstance(exc, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc)).lower()
+        return any(marker in message for marker in SESSION_DEAD_MARKERS)
+    return False
+
+
+def classify_failure(exc: BaseException) -> str:
+    """Map an exception raised while scraping to a failure class"""
+    if isinstance(exc, ListingFailure):
+        return exc.kind
+    if isinstance(exc, (TimeoutException, StaleElementReferenceException)):
+        return TRANSIENT
+    if is_session_dead(exc):
+        return TRANSIENT
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc)).lower()
+        if any(marker in message for marker in TRANSIENT_MARKERS):
+            return TRANSIENT
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return TRANSIENT
+    return STRUCTURAL
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter for the given (1-based) attempt"""
+    delay = min(cap, base * (2 ** (attempt - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class RetryQueue:
+    """
+    Deferred retry queue for transient failures.
+
+    Each URL gets up to `max_attempts` retries, each scheduled with exponential
+    backoff, and the whole run gets at most `budget` retries in total.
+    """
+    def __init__(self, max_attempts: int = 3, budget: int = 30,
+                 base_delay: float = 10.0, max_delay: float = 120.0):
+        self.max_attempts = max_attempts
+        self.budget = budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts: Dict[str, int] = {}
+        self.retries_used = 0
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = 0
+
+    @classmethod
+    def from_config(cls):
+        """Build a retry queue from the settings in config.py"""
+        import config
+        return cls(max_attempts=config.MAX_RETRIES,
+                   budget=config.RETRY_BUDGET,
+                   base_delay=config.RETRY_BASE_DELAY,
+                   max_delay=config.RETRY_MAX_DELAY)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def defer(self, url: str) -> bool:
+        """Schedule a retry for url. Returns False if it is out of attempts or the run is out of budget"""
+        attempt = self.attempts.get(url, 0) + 1
+        if attempt > self.max_attempts or self.retries_used >= self.budget:
+            return False
+
+        self.attempts[url] = attempt
+        self.retries_used += 1
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+        self._counter += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, url))
+        print(f"🔁 Retry {attempt}/{self.max_attempts} scheduled in {delay:.0f}s: {url}")
+        return True
+
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the next retry is due (0 if one is due now, None if empty)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def pop_ready(self, wait: bool = False) -> Optional[str]:
+        """Pop the next due URL. With wait=True, sleep until one is due"""
+        ready_in = self.next_ready_in()
+        if ready_in is None:
+            return None
+        if ready_in > 0:
+            if not wait:
+                return None
+            print(f"⏳ Waiting {ready_in:.0f}s for next retry...")
+            time.sleep(ready_in)
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> List[str]:
+        """Remove and return every URL still waiting for a retry"""
+        urls = [url for _, _, url in self._heap]
+        self._heap = []
+        return urls
@@ -0,0 +1,170 @@
+"""
+Admission control for scrape jobs in the web service
+At most `max_concurrent` browser jobs run at once, up to `max_queued` more wait in a FIFO queue,
+and anything beyond that is rejected so the container never runs out of memory.
+Every job gets its own output directory.
+"""
+
+import os
+import time
+import uuid
+import shutil
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue is full"""
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    def __init__(self, params: Dict, jobs_dir: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.state = QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.output_dir = os.path.join(jobs_dir, self.id)
+        self.output_path = os.path.join(self.output_dir, 'results.xlsx')
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'state': self.state,
+            'params': self.params,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'has_output': self.state == DONE and os.path.exists(self.output_path),
+        }
+
+
+class JobScheduler:
+    """
+    Bounded FIFO job queue served by `max_concurrent` worker threads.
+    `run_job(job)` does the work and should write its results to job.output_path.
+    """
+    def __init__(self, run_job: Callable[[Job], None], max_concurrent: int = 1, max_queued: int = 5,
+                 jobs_dir: str = 'jobs', keep_finished: int = 50, default_duration: float = 600):
+        self.run_job = run_job
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.jobs_dir = jobs_dir
+        self.keep_finished = keep_finished
+        self.avg_duration = default_duration  # EWMA of job run time, for Retry-After / ETA
+
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self.queue: Deque[Job] = deque()
+        self.running = 0
+        self._cond = threading.Condition()
+        self._workers = []
+
+    @classmethod
+    def from_config(cls, run_job):
+        import config
+        return cls(run_job,
+                   max_concurrent=config.MAX_CONCURRENT_JOBS,
+                   max_queued=config.MAX_QUEUED_JOBS,
+                   jobs_dir=config.JOBS_DIR,
+                   keep_finished=config.KEEP_FINISHED_JOBS,
+                   default_duration=config.DEFAULT_JOB_SECONDS)
+
+    def _start_workers(self):
+        # Started on first submit so importing the app doesn't spawn threads
+        while len(self._workers) < self.max_concurrent:
+            worker = threading.Thread(target=self._worker, name=f"scrape-worker-{len(self._workers)}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, params: Dict) -> Job:
+        """Queue a job, or raise QueueFull"""
+        with self._cond:
+            if len(self.queue) >= self.max_queued:
+                raise QueueFull(self.retry_after())
+            job = Job(params, self.jobs_dir)
+            self.jobs[job.id] = job
+            self.queue.append(job)
+            self._start_workers()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self.jobs.get(job_id)
+
+    def position(self, job: Job) -> int:
+        """1-based position in the queue (0 once the job has started)"""
+        with self._cond:
+            for i, queued in enumerate(self.queue, 1):
+                if queued is job:
+                    return i
+        return 0
+
+    def eta_seconds(self, job: Job) -> int:
+        """Rough wait until this job starts, from the average job duration"""
+        position = self.position(job)
+        if position == 0:
+            return 0
+        rounds = (position - 1) // self.max_concurrent + 1
+        return int(rounds * self.avg_duration)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up"""
+        return max(1, int(self.avg_duration / self.max_concurrent))
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'running': self.running,
+                'queued': len(self.queue),
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+            }
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self.queue:
+                    self._cond.wait()
+                job = self.queue.popleft()
+                job.state = RUNNING
+                job.started_at = time.time()
+                self.running += 1
+
+            state, error = DONE, None
+            try:
+                os.makedirs(job.output_dir, exist_ok=True)
+                self.run_job(job)
+            except Exception as e:
+                print(f"❌ Job {job.id} failed: {e}")
+                state, error = FAILED, str(e)
+
+            # Set together under the lock, state last: a job that reads as done/failed
+            # (even from a request that doesn't take the lock) already has its finish time
+            with self._cond:
+                job.finished_at = time.time()
+                job.error = error
+                job.state = state
+                self.running -= 1
+                duration = job.finished_at - job.started_at
+                self.avg_duration = 0.7 * self.avg_duration + 0.3 * duration
+                self._prune()
+
+    def _prune(self):
+        """Forget the oldest finished jobs (and their output) beyond keep_finished"""
+        finished = [job for job in self.jobs.values() if job.state in (DONE, FAILED)]
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job.id]
+            shutil.rmtree(job.output_dir, ignore_errors=True)
@@ -0,0 +1,99 @@
+"""
+Adaptive request pacing for the Dubizzle scraper
+AIMD controller: back off fast on errors/slow pages, creep back down when the site is healthy
+"""
+
+import time
+import random
+from collections import deque
+from typing import Deque, Optional
+
+
+class PacingController:
+    """
+    Keeps page loads under a hard politeness ceiling while tuning the delay between them.
+
+    The delay is the minimum gap between the *starts* of two consecutive page loads, so
+    time already spent rendering and clicking counts towards it.
+    - healthy load (latency under target): delay shrinks by `decrease_step` (additive decrease)
+    - slow load: delay grows by `slow_factor`
+    - HTTP error page / timeout / driver error: delay grows by `backoff_factor` (multiplicative increase)
+    The delay is always clamped to [min_delay, max_delay], and no more than
+    `max_requests_per_minute` loads are ever started in any 60 second window.
+    """
+    def __init__(self,
+                 min_delay: float = 2.0,
+                 max_delay: float = 60.0,
+                 initial_delay: float = 3.0,
+                 max_requests_per_minute: int = 12,
+                 latency_target: float = 6.0,
+                 decrease_step: float = 0.5,
+                 slow_factor: float = 1.25,
+                 backoff_factor: float = 2.0,
+                 jitter: float = 0.25):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_requests_per_minute = max_requests_per_minute
+        self.latency_target = latency_target
+        self.decrease_step = decrease_step
+        self.slow_factor = slow_factor
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+
+        self.delay = self._clamp(initial_delay)
+        self.last_request_start: Optional[float] = None
+        self.request_starts: Deque[float] = deque()
+        self.successes = 0
+        self.errors = 0
+
+    @classmethod
+    def from_config(cls):
+        """Build a controller from the settings in config.py"""
+        import config
+        return cls(min_delay=config.MIN_DELAY_BETWEEN_REQUESTS,
+                   max_delay=config.MAX_DELAY_BETWEEN_REQUESTS,
+                   initial_delay=config.DELAY_BETWEEN_REQUESTS,
+                   max_requests_per_minute=config.MAX_REQUESTS_PER_MINUTE,
+                   latency_target=config.TARGET_PAGE_LOAD_SECONDS)
+
+    def _clamp(self, delay):
+        # The per-minute ceiling is enforced separately by the sliding window in wait()
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def wait(self):
+        """Block until the next page load is allowed, then mark it as started"""
+        now = time.monotonic()
+        sleep_for = 0.0
+
+        if self.last_request_start is not None:
+            gap = self.delay * random.uniform(1.0, 1.0 + self.jitter)
+            sleep_for = max(sleep_for, self.last_request_start + gap - now)
+
+        # Sliding one-minute window for the hard ceiling
+        while self.request_starts and now - self.request_starts[0] >= 60.0:
+            self.request_starts.popleft()
+        if len(self.request_starts) >= self.max_requests_per_minute:
+            sleep_for = max(sleep_for, self.request_starts[0] + 60.0 - now)
+
+        if sleep_for > 0:
+            print(f"⏳ Pacing: waiting {sleep_for:.1f}s (delay {self.delay:.1f}s)")
+            time.sleep(sleep_for)
+
+        started = time.monotonic()
+        self.last_request_start = started
+        self.request_starts.append(started)
+
+    def record_success(self, latency: float):
+        """A page loaded fine in `latency` seconds"""
+        self.successes += 1
+        if latency > self.latency_target:
+            self.delay = self._clamp(self.delay * self.slow_factor)
+        else:
+            self.delay = self._clamp(self.delay - self.decrease_step)
+
+    def record_error(self, timeout: bool = False):
+        """A page load failed (error page, timeout or driver error)"""
+        self.errors += 1
+        self.delay = self._clamp(self.delay * self.backoff_factor)
+        kind = "timeout" if timeout else "error"
+        print(f"🐢 Pacing: {kind} - backing off, delay now {self.delay:.1f}s")
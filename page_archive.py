@@ -0,0 +1,80 @@
+"""
+Compressed archive of scraped pages (capture mode)
+Each page is saved as gzipped HTML and indexed in index.jsonl, so extraction can be re-run offline with replay.py.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+
+class PageArchive:
+    """
+    Layout:
+        <directory>/index.jsonl                      one JSON line per captured page
+        <directory>/<YYYYMMDD>/<hash>-<kind>.html.gz  the page HTML
+    Index lines: {"file", "url", "kind", "captured_at", "live": {fields extracted during the live run}}
+    """
+    INDEX_NAME = 'index.jsonl'
+
+    def __init__(self, directory: str, compress_level: int = 6):
+        self.directory = directory
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        """Archive in config.CAPTURE_DIR, or None if capture mode is off"""
+        import config
+        if not config.CAPTURE_DIR:
+            return None
+        return cls(config.CAPTURE_DIR)
+
+    def save(self, url: str, html: str, kind: str = 'listing', live_result: Optional[Dict] = None) -> str:
+        """Save one page, returns its path"""
+        now = datetime.now()
+        key = hashlib.sha1(f"{url}|{now.isoformat()}".encode()).hexdigest()[:16]
+        relative = os.path.join(now.strftime('%Y%m%d'), f"{key}-{kind}.html.gz")
+        path = os.path.join(self.directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)  # also creates the archive directory itself
+
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=self.compress_level) as f:
+            f.write(html)
+
+        entry = {
+            'file': relative,
+            'url': url,
+            'kind': kind,
+            'captured_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        if live_result:
+            entry['live'] = live_result
+        with self._lock, open(os.path.join(self.directory, self.INDEX_NAME), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return path
+
+    def entries(self, kind: Optional[str] = None) -> Iterator[Dict]:
+        """Index entries (optionally of one kind), with 'path' set to the absolute file path"""
+        index_path = os.path.join(self.directory, self.INDEX_NAME)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if kind and entry.get('kind') != kind:
+                    continue
+                entry['path'] = os.path.join(self.directory, entry['file'])
+                yield entry
+
+
+def load_html(path: str) -> str:
+    """Read an archived page"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return f.read()
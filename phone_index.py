@@ -0,0 +1,296 @@
+"""
+Indexed query layer over the collected phone numbers
+Builds a SQLite index from the 'Master Data' sheet of the workbook and rebuilds it
+whenever the workbook changes, so the API can answer lookups without reading the .xlsx.
+"""
+
+import os
+import base64
+import binascii
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from extractors import normalize_phone, parse_listing_url, parse_price
+
+MAX_PAGE_SIZE = 200
+INDEX_VERSION = 2  # bump when indexing changes (e.g. phone normalization) to force a rebuild
+
+SCHEMA = """
+CREATE TABLE listings (
+    id INTEGER PRIMARY KEY,
+    url TEXT,
+    title TEXT,
+    price_text TEXT,
+    price INTEGER,
+    phone TEXT,
+    phone_norm TEXT,
+    make TEXT,
+    model TEXT,
+    listed_date TEXT,
+    scraped_at TEXT
+);
+CREATE INDEX listings_phone ON listings (phone_norm, id);
+CREATE INDEX listings_scraped ON listings (scraped_at, id);
+CREATE INDEX listings_price ON listings (price, id);
+CREATE INDEX listings_make ON listings (make, id);
+
+CREATE TABLE phones (
+    phone_norm TEXT PRIMARY KEY,
+    phone TEXT,
+    listings INTEGER,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE INDEX phones_last_seen ON phones (last_seen);
+
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def encode_cursor(value) -> str:
+    return base64.urlsafe_b64encode(str(value).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value = base64.b64decode(padded.encode(), altchars=b'-_', validate=True).decode()
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError("invalid cursor")
+    if not value:
+        raise ValueError("invalid cursor")
+    return value
+
+
+class PhoneIndex:
+    """SQLite index of the workbook's Master Data, refreshed when the workbook's mtime/size changes"""
+    def __init__(self, workbook: str = 'Dubizzle Data.xlsx', db_path: str = 'phone_index.db'):
+        self.workbook = workbook
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+    def _signature(self) -> Optional[str]:
+        try:
+            stat = os.stat(self.workbook)
+        except OSError:
+            return None
+        return f"{INDEX_VERSION}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _indexed_signature(self) -> Optional[str]:
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def refresh(self) -> bool:
+        """Rebuild the index if the workbook changed. Returns True if it was rebuilt"""
+        signature = self._signature()
+        if signature is None or signature == self._indexed_signature():
+            return False
+        with self._lock:
+            if signature == self._indexed_signature():
+                return False  # Another thread just rebuilt it
+            try:
+                self.build(signature)
+            except Exception as e:
+                # Usually the workbook is being rewritten right now - keep serving the old index
+                # and try again on the next request
+                print(f"⚠️ Could not index {self.workbook}, keeping the previous index: {e}")
+                return False
+        return True
+
+    def build(self, signature: Optional[str] = None):
+        """Build the index into a temp file and swap it in"""
+        from openpyxl import load_workbook
+
+        print(f"🗂️ Indexing {self.workbook}...")
+        tmp_path = f"{self.db_path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        conn = None
+        book = None
+        try:
+            book = load_workbook(self.workbook, read_only=True)
+            sheet = book['Master Data'] if 'Master Data' in book.sheetnames else book.active
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(h) if h is not None else '' for h in next(rows, ())]
+            column = {name: i for i, name in enumerate(header)}
+
+            def value(row, name):
+                i = column.get(name)
+                if i is None or i >= len(row) or row[i] is None:
+                    return ''
+                return str(row[i])
+
+            conn = sqlite3.connect(tmp_path)
+            conn.executescript(SCHEMA)
+            batch = []
+            for row in rows:
+                url = value(row, 'URL')
+                phone = value(row, 'Real_Phone_Number')
+                if phone.lower() == 'nan':
+                    phone = ''
+                make, model, listed_date = parse_listing_url(url)
+                price_text = value(row, 'Price')
+                batch.append((url, value(row, 'Title'), price_text, parse_price(price_text),
+                              phone, normalize_phone(phone) or None, make, model, listed_date,
+                              value(row, 'Date_Scraped')))
+                if len(batch) >= 1000:
+                    conn.executemany("INSERT INTO listings (url, title, price_text, price, phone, phone_norm,"
+                                     " make, model, listed_date, scraped_at) VALUES (?,?,?,?,?,?,?,?,?,?)", batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT INTO listings (url, title, price_text, price, phone, phone_norm,"
+                                 " make, model, listed_date, scraped_at) VALUES (?,?,?,?,?,?,?,?,?,?)", batch)
+
+            conn.execute("""
+                INSERT INTO phones (phone_norm, phone, listings, first_seen, last_seen)
+                SELECT phone_norm, MIN(phone), COUNT(*), MIN(scraped_at), MAX(scraped_at)
+                FROM listings WHERE phone_norm IS NOT NULL GROUP BY phone_norm
+            """)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('signature', ?)",
+                         (signature or self._signature() or '',))
+            conn.commit()
+            count = conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+            conn.close()
+            conn = None
+            os.replace(tmp_path, self.db_path)
+        finally:
+            if conn is not None:
+                conn.close()
+            if book is not None:
+                book.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        print(f"  ✅ Indexed {count} listings")
+
+    def _connect(self):
+        self.refresh()
+        if not os.path.exists(self.db_path):
+            return None
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _page_size(limit) -> int:
+        return max(1, min(int(limit or 50), MAX_PAGE_SIZE))
+
+    @staticmethod
+    def _listing_json(row) -> Dict:
+        return {
+            'url': row['url'],
+            'title': row['title'],
+            'price': row['price'],
+            'price_text': row['price_text'],
+            'phone': row['phone'],
+            'make': row['make'],
+            'model': row['model'],
+            'listed_date': row['listed_date'],
+            'scraped_at': row['scraped_at'],
+        }
+
+    def query_listings(self, phone_prefix=None, since=None, until=None, min_price=None, max_price=None,
+                       make=None, cursor=None, limit=50) -> Tuple[List[Dict], Optional[str]]:
+        """Listings matching the filters, newest rows first. Returns (items, next_cursor)"""
+        conn = self._connect()
+        if conn is None:
+            return [], None
+
+        where, params = [], []
+        if phone_prefix:
+            prefix = normalize_phone(phone_prefix)
+            where.append("phone_norm >= ? AND phone_norm < ?")
+            params += [prefix, prefix + ':']  # ':' sorts right after '9'
+        if since:
+            where.append("scraped_at >= ?")
+            params.append(since)
+        if until:
+            where.append("scraped_at <= ?")
+            params.append(until if len(until) > 10 else until + ' 23:59:59')
+        if min_price is not None:
+            where.append("price >= ?")
+            params.append(int(min_price))
+        if max_price is not None:
+            where.append("price <= ?")
+            params.append(int(max_price))
+        if make:
+            where.append("make = ?")
+            params.append(make.lower())
+        after = decode_cursor(cursor)
+        if after is not None:
+            where.append("id < ?")
+            params.append(int(after))
+
+        size = self._page_size(limit)
+        sql = "SELECT * FROM listings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with conn:
+            rows = conn.execute(sql, params + [size + 1]).fetchall()
+        conn.close()
+
+        next_cursor = encode_cursor(rows[size - 1]['id']) if len(rows) > size else None
+        return [self._listing_json(row) for row in rows[:size]], next_cursor
+
+    def query_phones(self, prefix=None, since=None, until=None, cursor=None, limit=50) -> Tuple[List[Dict], Optional[str]]:
+        """Distinct phones (with listing counts), ordered by number. Date range filters on last_seen"""
+        conn = self._connect()
+        if conn is None:
+            return [], None
+
+        where, params = [], []
+        if prefix:
+            normalized = normalize_phone(prefix)
+            where.append("phone_norm >= ? AND phone_norm < ?")
+            params += [normalized, normalized + ':']
+        if since:
+            where.append("last_seen >= ?")
+            params.append(since)
+        if until:
+            where.append("last_seen <= ?")
+            params.append(until if len(until) > 10 else until + ' 23:59:59')
+        after = decode_cursor(cursor)
+        if after is not None:
+            where.append("phone_norm > ?")
+            params.append(after)
+
+        size = self._page_size(limit)
+        sql = "SELECT * FROM phones"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY phone_norm LIMIT ?"
+        with conn:
+            rows = conn.execute(sql, params + [size + 1]).fetchall()
+        conn.close()
+
+        items = [{
+            'phone': row['phone'],
+            'normalized': row['phone_norm'],
+            'listings': row['listings'],
+            'first_seen': row['first_seen'],
+            'last_seen': row['last_seen'],
+        } for row in rows[:size]]
+        next_cursor = encode_cursor(rows[size - 1]['phone_norm']) if len(rows) > size else None
+        return items, next_cursor
+
+    def lookup_phone(self, phone: str) -> List[Dict]:
+        """Every listing seen with this number (any format: +971..., 05..., 00971...)"""
+        conn = self._connect()
+        if conn is None:
+            return []
+        with conn:
+            rows = conn.execute("SELECT * FROM listings WHERE phone_norm = ? ORDER BY id DESC",
+                                (normalize_phone(phone),)).fetchall()
+        conn.close()
+        return [self._listing_json(row) for row in rows]
@@ -0,0 +1,147 @@
+"""
+Compact result records and a disk spool for bounded-memory ("ALL") runs
+Results are kept as tuples, flushed to a CSV spool in fixed-size batches, and the
+final workbook is streamed row by row with openpyxl write-only mode.
+"""
+
+import os
+import csv
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+
+class ListingRecord(NamedTuple):
+    """One scraped listing - a tuple, so much lighter than the 8-key dict it replaces"""
+    URL: str
+    Title: str
+    Price: str
+    Real_Phone_Number: str
+    Fake_Phone_Before: str
+    Button_Clicked: str
+    Phone_Revealed: str
+    Date_Scraped: str
+
+    @classmethod
+    def from_result(cls, result: Dict) -> 'ListingRecord':
+        """Build from a get_real_phone_number() result dict (missing/None values become '')"""
+        return cls(*(str(result.get(field) or '') for field in cls._fields))
+
+
+RECORD_FIELDS = list(ListingRecord._fields)
+SUMMARY_FIELDS = ['Real_Phone_Number', 'Title', 'Price', 'URL', 'Date_Scraped']
+
+
+class RecordSpool:
+    """
+    Append-only CSV of ListingRecords. Records are buffered in memory and written
+    out every `batch_size` records, so only one batch is ever held at a time.
+    """
+    def __init__(self, path: str, batch_size: int = 50):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer: List[ListingRecord] = []
+        self.flushed = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(RECORD_FIELDS)
+
+    def __len__(self):
+        return self.flushed + len(self.buffer)
+
+    def append(self, record: ListingRecord):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(self.buffer)
+        self.flushed += len(self.buffer)
+        print(f"💾 Flushed {len(self.buffer)} records to {self.path} ({self.flushed} total)")
+        self.buffer = []
+
+    def __iter__(self) -> Iterator[ListingRecord]:
+        """Read back every record (flushes first)"""
+        self.flush()
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                yield ListingRecord(*row)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_streamed_workbook(filename: str, spool: RecordSpool) -> Dict[str, int]:
+    """
+    Write the usual 3-sheet workbook (Master Data / New Numbers Only / New Phones Summary)
+    without loading it into memory: existing Master Data rows are streamed from the old
+    file (read-only mode), new rows from the spool, into a write-only workbook.
+    Returns counts for the summary.
+    """
+    from openpyxl import Workbook, load_workbook
+
+    stats = {'existing': 0, 'new': 0, 'new_phones': 0, 'new_buttons_clicked': 0, 'total_phones': 0}
+
+    old_book = None
+    old_rows: Optional[Iterator] = None
+    columns = list(RECORD_FIELDS)
+    if os.path.exists(filename):
+        try:
+            old_book = load_workbook(filename, read_only=True)
+            old_sheet = old_book['Master Data'] if 'Master Data' in old_book.sheetnames else old_book.active
+            old_rows = old_sheet.iter_rows(values_only=True)
+            header = [str(h) for h in next(old_rows, ()) if h is not None]
+            columns = header + [field for field in RECORD_FIELDS if field not in header]
+        except Exception as e:
+            print(f"⚠️ Error reading existing file: {e}")
+            print("📝 Creating new file with current data")
+            old_rows = None
+
+    phone_column = columns.index('Real_Phone_Number')
+    book = Workbook(write_only=True)
+
+    # Sheet 1: Master Data (existing rows + new rows)
+    master = book.create_sheet('Master Data')
+    master.append(columns)
+    if old_rows is not None:
+        for row in old_rows:
+            row = list(row)[:len(columns)]
+            master.append(row)
+            stats['existing'] += 1
+            if phone_column < len(row) and row[phone_column] not in (None, ''):
+                stats['total_phones'] += 1
+    for record in spool:
+        values = record._asdict()
+        master.append([values.get(column, '') for column in columns])
+
+    # Sheet 2: New Numbers Only
+    new_sheet = book.create_sheet('New Numbers Only')
+    new_sheet.append(RECORD_FIELDS)
+    for record in spool:
+        new_sheet.append(list(record))
+        stats['new'] += 1
+        if record.Real_Phone_Number:
+            stats['new_phones'] += 1
+        if record.Button_Clicked == 'Yes':
+            stats['new_buttons_clicked'] += 1
+    stats['total_phones'] += stats['new_phones']
+
+    # Sheet 3: New Phones Summary
+    if stats['new_phones']:
+        summary = book.create_sheet('New Phones Summary')
+        summary.append(['Phone Number'] + SUMMARY_FIELDS[1:])
+        for record in spool:
+            if record.Real_Phone_Number:
+                summary.append([getattr(record, field) for field in SUMMARY_FIELDS])
+
+    # Write next to the old file, then swap it in
+    tmp_filename = f"{filename}.tmp.xlsx"
+    book.save(tmp_filename)
+    if old_book is not None:
+        old_book.close()
+    os.replace(tmp_filename, filename)
+    return stats
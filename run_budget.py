@@ -0,0 +1,62 @@
+"""
+Wall-clock budget for a scrape run
+Tracks elapsed time against `max_duration`, learns the per-car cost as the run goes,
+and tells the scraper whether one more car still fits.
+"""
+
+import time
+from typing import Optional
+
+
+class RunBudget:
+    """
+    Call mark() at the start of every car: the time since the previous mark is the
+    previous car's cost. Only fully processed cars (full=True) feed the per-car estimate -
+    quick duplicate skips and dead listings would drag it down to a few seconds - and the
+    estimate is an EWMA seeded with `initial_estimate`, so one odd car can't replace it.
+    can_fit() then says whether another full car (plus any extra wait, e.g. for a retry
+    backoff) fits in what is left. With max_duration=None the run is unbounded and everything fits.
+    """
+    def __init__(self, max_duration: Optional[float] = None, initial_estimate: float = 30.0,
+                 smoothing: float = 0.3):
+        self.max_duration = max_duration
+        self.estimate = initial_estimate
+        self.smoothing = smoothing
+        self.started = time.monotonic()
+        self.cars_measured = 0
+        self._last_mark: Optional[float] = None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        if self.max_duration is None:
+            return None
+        return self.max_duration - self.elapsed()
+
+    def deadline(self, share: float = 1.0) -> Optional[float]:
+        """time.monotonic() value by which `share` of the budget is used up"""
+        if self.max_duration is None:
+            return None
+        return self.started + self.max_duration * share
+
+    def mark(self, full: bool = True):
+        """A new car starts now; `full` says whether the previous one (if any) was fully processed"""
+        now = time.monotonic()
+        if self._last_mark is not None and full:
+            duration = now - self._last_mark
+            self.estimate = (1 - self.smoothing) * self.estimate + self.smoothing * duration
+            self.cars_measured += 1
+        self._last_mark = now
+
+    def can_fit(self, extra_wait: float = 0.0) -> bool:
+        """Whether one more fully processed car (after waiting extra_wait seconds) is expected to finish in time"""
+        remaining = self.remaining()
+        return remaining is None or remaining >= self.estimate + extra_wait
+
+    def cars_left(self) -> Optional[int]:
+        """How many more cars should fit at the current pace"""
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return max(0, int(remaining // max(self.estimate, 0.001)))
@@ -0,0 +1,78 @@
+"""
+Multi-tab prefetching inside a single Chrome session
+While the foreground tab does the click/reveal/extract sequence, the next listings
+load in background tabs, so page-load waits overlap without a second browser.
+"""
+
+import time
+from typing import Dict, Tuple
+
+from selenium.common.exceptions import TimeoutException
+
+# Navigation Timing: how long the tab's page took to load, in seconds (None if not finished)
+LOAD_DURATION_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav && nav.loadEventEnd > 0 ? nav.loadEventEnd / 1000 : null;
+"""
+
+
+class TabPool:
+    """
+    One foreground tab plus up to `tabs - 1` background tabs of the same driver.
+
+    open(url) starts loading a URL in a new background tab without waiting for it
+    (window.open returns immediately); activate(url) closes the current foreground
+    tab and switches to the prefetched one once it has finished loading.
+    Background loads wait on the pacing controller like any other page load; the caller
+    reports the result of activate() back to it.
+    """
+    def __init__(self, driver, pacer, tabs: int = 3, load_timeout: float = 30):
+        self.driver = driver
+        self.pacer = pacer
+        self.background_slots = max(0, tabs - 1)
+        self.load_timeout = load_timeout
+        self.prefetched: Dict[str, Tuple[str, float]] = {}  # url -> (window handle, opened at)
+
+    def has(self, url: str) -> bool:
+        return url in self.prefetched
+
+    def free_slots(self) -> int:
+        return self.background_slots - len(self.prefetched)
+
+    def open(self, url: str):
+        """Start loading url in a new background tab (the foreground tab stays current)"""
+        foreground = self.driver.current_window_handle
+        before = set(self.driver.window_handles)
+
+        self.pacer.wait()
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+
+        new_handles = set(self.driver.window_handles) - before
+        if not new_handles:
+            print(f"  ⚠️ Could not open background tab for {url}")
+            return
+        self.prefetched[url] = (new_handles.pop(), time.monotonic())
+        # Chrome may focus the new tab - make sure the driver still points at the foreground one
+        self.driver.switch_to.window(foreground)
+        print(f"  🗂️ Prefetching in background tab ({len(self.prefetched)}/{self.background_slots}): {url}")
+
+    def activate(self, url: str) -> float:
+        """
+        Close the foreground tab and make the prefetched tab for url the new foreground.
+        Returns the page load time in seconds; raises TimeoutException if it never finished loading.
+        """
+        handle, opened_at = self.prefetched.pop(url)
+        self.driver.close()
+        self.driver.switch_to.window(handle)
+
+        deadline = opened_at + self.load_timeout
+        while self.driver.execute_script("return document.readyState") != 'complete':
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"background tab did not finish loading {url}")
+            time.sleep(0.2)
+
+        latency = self.driver.execute_script(LOAD_DURATION_JS)
+        if not latency:
+            latency = time.monotonic() - opened_at
+        print(f"  🗂️ Switched to prefetched tab (loaded in {latency:.1f}s)")
+        return latency
@@ -0,0 +1,343 @@
+"""
+Shared work queue so several scraper instances can cooperate on one crawl
+Listing URLs are claimed under a lease, acked when done, and phones go into a shared dedup set.
+Each crawl (normalized search URL) has its own listings; the phone set is shared by all of them.
+
+Backends:
+- SQLiteWorkQueue: a single SQLite file (default) - works for instances sharing a disk
+- RedisWorkQueue: any Redis-protocol server (redis, valkey, fakeredis for local testing)
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import threading
+import uuid
+import hashlib
+from typing import Dict, Iterable, Optional
+
+
+LISTINGS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        crawl TEXT NOT NULL DEFAULT '',
+        url TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT 'pending',
+        lease_until REAL,
+        worker TEXT,
+        enqueued_at REAL NOT NULL,
+        priority REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (crawl, url)
+    )
+"""
+
+
+def default_worker_id():
+    """hostname:pid:random - unique per scraper instance"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """
+    Interface for a shared listing queue with leases and a shared phone dedup set.
+
+    A claimed URL is leased to this worker for `lease_seconds`. If the worker dies
+    without acking or releasing it, the lease expires and another worker can claim it.
+
+    Listings belong to a `crawl` (the normalized search URL): workers only see the listings
+    of their own crawl. Once a crawl is fully drained (nothing pending or leased), the next
+    enqueue starts it over, so a later rerun of the same search visits its listings again.
+    """
+    def __init__(self, lease_seconds: float = 900, worker_id: Optional[str] = None, crawl: str = ''):
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or default_worker_id()
+        self.crawl = crawl
+
+    def enqueue(self, urls: Iterable[str], priorities: Optional[Dict[str, float]] = None) -> int:
+        """Add URLs not yet seen in this crawl (with an optional priority each). Returns how many were new"""
+        raise NotImplementedError
+
+    def claim(self) -> Optional[str]:
+        """Atomically lease the highest-priority pending URL (or one whose lease expired)"""
+        raise NotImplementedError
+
+    def ack(self, url: str):
+        """Mark a claimed URL as finished"""
+        raise NotImplementedError
+
+    def release(self, url: str):
+        """Give a claimed URL back to the queue without finishing it"""
+        raise NotImplementedError
+
+    def add_phone(self, phone: str) -> bool:
+        """Add a normalized phone to the shared set. Returns False if it was already there"""
+        raise NotImplementedError
+
+    def has_phone(self, phone: str) -> bool:
+        """Check the shared phone set"""
+        raise NotImplementedError
+
+    def pending_count(self) -> int:
+        """Number of URLs waiting to be claimed"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Work queue in a SQLite file. Claims run in BEGIN IMMEDIATE transactions so they are atomic across processes"""
+    def __init__(self, path: str = 'work_queue.db', **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(listings)")]
+        if columns and 'crawl' not in columns:
+            self._migrate(columns)
+        self._conn.execute(LISTINGS_SCHEMA.format(table='listings'))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS listings_crawl_state ON listings (crawl, state, lease_until)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS phones (phone TEXT PRIMARY KEY)")
+
+    def _migrate(self, columns):
+        """Rebuild a queue file from before crawls (url-only key) - its listings go to the '' crawl"""
+        priority = 'priority' if 'priority' in columns else '0'
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DROP INDEX IF EXISTS listings_state")
+            self._conn.execute(LISTINGS_SCHEMA.format(table='listings_new'))
+            self._conn.execute(
+                "INSERT INTO listings_new (crawl, url, state, lease_until, worker, enqueued_at, priority)"
+                f" SELECT '', url, state, lease_until, worker, enqueued_at, {priority} FROM listings")
+            self._conn.execute("DROP TABLE listings")
+            self._conn.execute("ALTER TABLE listings_new RENAME TO listings")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, urls, priorities=None):
+        priorities = priorities or {}
+        now = time.time()
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                unfinished = self._conn.execute(
+                    "SELECT 1 FROM listings WHERE crawl = ? AND state != 'done' LIMIT 1", (self.crawl,)).fetchone()
+                if not unfinished:
+                    # Previous crawl of this search is over - start a fresh one
+                    self._conn.execute("DELETE FROM listings WHERE crawl = ?", (self.crawl,))
+                for url in urls:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO listings (crawl, url, enqueued_at, priority) VALUES (?, ?, ?, ?)",
+                        (self.crawl, url, now, priorities.get(url, 0)))
+                    added += cursor.rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def claim(self):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT url FROM listings"
+                    " WHERE crawl = ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?))"
+                    " ORDER BY priority DESC, enqueued_at LIMIT 1", (self.crawl, now)).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE listings SET state = 'leased', lease_until = ?, worker = ? WHERE crawl = ? AND url = ?",
+                        (now + self.lease_seconds, self.worker_id, self.crawl, row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row[0] if row else None
+
+    def ack(self, url):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE listings SET state = 'done', lease_until = NULL WHERE crawl = ? AND url = ?",
+                (self.crawl, url))
+
+    def release(self, url):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE listings SET state = 'pending', lease_until = NULL, worker = NULL"
+                " WHERE crawl = ? AND url = ? AND state = 'leased' AND worker = ?",
+                (self.crawl, url, self.worker_id))
+
+    def add_phone(self, phone):
+        with self._lock:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO phones (phone) VALUES (?)", (phone,))
+        return cursor.rowcount == 1
+
+    def has_phone(self, phone):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM phones WHERE phone = ?", (phone,)).fetchone()
+        return row is not None
+
+    def pending_count(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM listings"
+                " WHERE crawl = ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?))",
+                (self.crawl, time.time())).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Work queue on a Redis-protocol server.
+
+    Keys of a crawl (under `prefix:<crawl hash>`): seen (SET of every URL enqueued in the crawl),
+    queue (ZSET url -> priority), priority (HASH url -> priority, for requeues),
+    leases (ZSET url -> lease expiry), owners (HASH url -> worker holding the lease), done (SET).
+    phones (SET, under `prefix`) is shared by all crawls.
+    Every state change (enqueue, claim, requeue of an expired lease, release) is a single
+    WATCH/MULTI transaction, so a worker dying mid-step never loses a URL and two workers
+    can never both win the same one.
+    Any client with the redis-py API works, e.g. fakeredis.FakeRedis() for local testing.
+    """
+    def __init__(self, client, prefix: str = 'dubizzle', **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The Redis work queue needs the 'redis' package: pip install redis")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, name):
+        if name == 'phones' or not self.crawl:
+            return f"{self.prefix}:{name}"
+        crawl_id = hashlib.sha1(self.crawl.encode()).hexdigest()[:16]
+        return f"{self.prefix}:{crawl_id}:{name}"
+
+    @staticmethod
+    def _decode(value):
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _transaction(self, func, *keys):
+        """Run func(pipe) with `keys` watched, retrying it if another worker changed them first"""
+        return self.client.transaction(func, *[self._key(key) for key in keys], value_from_callable=True)
+
+    def _requeue(self, pipe, url):
+        """Queue commands moving a leased URL back to the queue (call after reading, before pipe.multi())"""
+        priority = pipe.hget(self._key('priority'), url)
+        pipe.multi()
+        pipe.zrem(self._key('leases'), url)
+        pipe.hdel(self._key('owners'), url)
+        pipe.zadd(self._key('queue'), {url: float(priority or 0)})
+
+    def _requeue_expired(self):
+        now = time.time()
+        for url in self.client.zrangebyscore(self._key('leases'), '-inf', now):
+            url = self._decode(url)
+
+            def requeue(pipe):
+                expiry = pipe.zscore(self._key('leases'), url)
+                if expiry is None or expiry > now:
+                    return  # Another worker already requeued (or re-claimed) it
+                self._requeue(pipe, url)
+
+            self._transaction(requeue, 'leases')
+
+    def enqueue(self, urls, priorities=None):
+        priorities = priorities or {}
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+
+        def add_new(pipe):
+            if pipe.zcard(self._key('queue')) == 0 and pipe.zcard(self._key('leases')) == 0:
+                # Previous crawl of this search is over - start a fresh one
+                new = urls
+                pipe.multi()
+                pipe.delete(*[self._key(name) for name in ('seen', 'priority', 'owners', 'done')])
+            else:
+                known = pipe.smismember(self._key('seen'), urls)
+                new = [url for url, seen in zip(urls, known) if not seen]
+                pipe.multi()
+            if new:
+                pipe.sadd(self._key('seen'), *new)
+                pipe.hset(self._key('priority'), mapping={url: priorities.get(url, 0) for url in new})
+                pipe.zadd(self._key('queue'), {url: priorities.get(url, 0) for url in new})
+            return len(new)
+
+        return self._transaction(add_new, 'seen', 'queue', 'leases')
+
+    def claim(self):
+        self._requeue_expired()
+
+        def take(pipe):
+            top = pipe.zrevrange(self._key('queue'), 0, 0)
+            if not top:
+                return None
+            url = self._decode(top[0])
+            pipe.multi()
+            pipe.zrem(self._key('queue'), url)
+            pipe.zadd(self._key('leases'), {url: time.time() + self.lease_seconds})
+            pipe.hset(self._key('owners'), url, self.worker_id)
+            return url
+
+        return self._transaction(take, 'queue')
+
+    def ack(self, url):
+        pipe = self.client.pipeline()
+        pipe.zrem(self._key('leases'), url)
+        pipe.hdel(self._key('owners'), url)
+        pipe.hdel(self._key('priority'), url)
+        pipe.sadd(self._key('done'), url)
+        pipe.execute()
+
+    def release(self, url):
+        def give_back(pipe):
+            if self._decode(pipe.hget(self._key('owners'), url)) != self.worker_id:
+                return  # Not our lease (any more) - it expired and someone else may hold it
+            self._requeue(pipe, url)
+
+        self._transaction(give_back, 'owners')
+
+    def add_phone(self, phone):
+        return bool(self.client.sadd(self._key('phones'), phone))
+
+    def has_phone(self, phone):
+        return bool(self.client.sismember(self._key('phones'), phone))
+
+    def pending_count(self):
+        return self.client.zcard(self._key('queue'))
+
+    def close(self):
+        close = getattr(self.client, 'close', None)
+        if close:
+            close()
+
+
+def open_work_queue(url: Optional[str], **kwargs) -> Optional[WorkQueue]:
+    """
+    Open a work queue from a URL:
+    - '' / None             -> no shared queue (single-instance mode)
+    - redis://host:6379/0   -> RedisWorkQueue
+    - sqlite:///path/to.db  -> SQLiteWorkQueue (a bare file path works too)
+    """
+    if not url:
+        return None
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisWorkQueue.from_url(url, **kwargs)
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    return SQLiteWorkQueue(url, **kwargs)